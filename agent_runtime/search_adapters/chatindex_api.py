@@ -1,23 +1,243 @@
 from __future__ import annotations
 
+import logging
 import sqlite3
 import time
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from queue import Empty, Full, Queue
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
 
 from .common import (
+    attach_fts_index,
+    build_fts_prefix_query,
+    drop_legacy_fts_objects,
     extract_search_snippet,
+    fts_rank_score_sql,
+    is_fts5_unavailable_error,
     parse_limit,
     parse_query,
     resolve_database_path,
-    score_text_match,
-    sort_time_value,
+    resolve_fts_index_path,
+    sync_message_fts,
+    text_match_score_sql,
 )
 
 app = FastAPI(title="OpenWork ChatIndex Adapter", version="0.1.0")
 
+CONNECTION_POOL_SIZE = 8
+
+# Per-connection read tuning only. The journal mode is a property of the
+# database file and belongs to the app that writes it.
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+STATEMENT_CACHE_SIZE = 256
+SHORT_NEEDLE_LENGTH = 3
+# Raw characters kept on each side of the first match; wider than the snippet
+# radius so whitespace collapsing still leaves a full snippet.
+SNIPPET_WINDOW_RADIUS = 240
+
+REQUIRE_USER_SQL = 'SELECT "id" FROM "User" WHERE "id" = ? LIMIT 1'
+
+CHANNEL_SCORE_SQL = f'''max(
+      {text_match_score_sql('ch."name"')},
+      {text_match_score_sql('ch."slug"')}
+    )'''
+
+DM_SCORE_SQL = f'''max(
+      {text_match_score_sql('peer."displayName"')},
+      {text_match_score_sql('peer."id"')}
+    )'''
+
+CHANNEL_LIKE_SOURCE = '''
+  FROM "Conversation" c
+  JOIN "Channel" ch ON ch."id" = c."channelId"
+  WHERE c."type" = 'CHANNEL'
+    AND (lower(ch."name") LIKE :like_query OR lower(ch."slug") LIKE :like_query)
+'''
+
+MESSAGE_JOINS = '''
+  JOIN "Conversation" c ON c."id" = m."conversationId"
+  JOIN "User" sender ON sender."id" = m."senderId"
+  LEFT JOIN "Channel" ch ON ch."id" = c."channelId"
+  LEFT JOIN "User" peer ON peer."id" = CASE
+    WHEN c."dmUserAId" = :user_id THEN c."dmUserBId"
+    WHEN c."dmUserBId" = :user_id THEN c."dmUserAId"
+  END
+'''
+
+MESSAGE_VISIBILITY_FILTER = '''
+    AND (
+      c."type" = 'CHANNEL'
+      OR (
+        c."type" = 'DM'
+        AND (c."dmUserAId" = :user_id OR c."dmUserBId" = :user_id)
+      )
+    )
+'''
+
+MESSAGE_FTS_SOURCE = f'''
+  FROM search."message_search"
+  JOIN search."message_doc" d ON d."docid" = "message_search".rowid
+  JOIN "Message" m ON m."id" = d."message_id"
+  {MESSAGE_JOINS}
+  WHERE "message_search" MATCH :fts_query
+  {MESSAGE_VISIBILITY_FILTER}
+'''
+
+MESSAGE_LIKE_SOURCE = f'''
+  FROM "Message" m
+  {MESSAGE_JOINS}
+  WHERE lower(m."body") LIKE :like_query
+  {MESSAGE_VISIBILITY_FILTER}
+'''
+
+# Short needles match most bodies as substrings; restrict them to word
+# prefixes, which is also what the FTS prefix query matches.
+MESSAGE_SHORT_LIKE_SOURCE = f'''
+  FROM "Message" m
+  {MESSAGE_JOINS}
+  WHERE (lower(m."body") LIKE :prefix_query OR lower(m."body") LIKE :word_prefix_query)
+  {MESSAGE_VISIBILITY_FILTER}
+'''
+
+
+def _build_search_sql(mode: str) -> str:
+    # Channels are few and renamed in place, so they are always matched by
+    # substring; only message bodies go through the FTS index.
+    if mode == "fts":
+        message_score = fts_rank_score_sql("message_search")
+        message_source = MESSAGE_FTS_SOURCE
+    else:
+        message_score = text_match_score_sql('m."body"')
+        message_source = MESSAGE_SHORT_LIKE_SOURCE if mode == "like-short" else MESSAGE_LIKE_SOURCE
+
+    # Every branch yields the same column shape so the kinds can be merged,
+    # ordered and trimmed in one statement. DM peers are deduped by GROUP BY,
+    # which keeps the bare columns of the max(match_score) row.
+    return f'''
+WITH channels_q AS (
+  SELECT
+    'channel' AS kind,
+    c."id" AS result_id,
+    c."id" AS conversation_id,
+    c."createdAt" AS created_at,
+    {CHANNEL_SCORE_SQL} AS match_score,
+    ch."name" AS channel_name,
+    ch."slug" AS channel_slug,
+    NULL AS other_user_id,
+    NULL AS other_user_name,
+    NULL AS sender_name,
+    NULL AS body,
+    NULL AS body_offset,
+    NULL AS body_length,
+    NULL AS conversation_type
+  {CHANNEL_LIKE_SOURCE}
+  ORDER BY match_score DESC, created_at DESC
+  LIMIT :channel_limit
+),
+dm_candidates AS (
+  SELECT
+    c."id" AS conversation_id,
+    c."createdAt" AS created_at,
+    {DM_SCORE_SQL} AS match_score,
+    peer."id" AS other_user_id,
+    peer."displayName" AS other_user_name
+  FROM "Conversation" c
+  JOIN "User" peer ON peer."id" = c."dmUserBId"
+  WHERE c."type" = 'DM'
+    AND c."dmUserAId" = :user_id
+    AND (lower(peer."displayName") LIKE :like_query OR lower(peer."id") LIKE :like_query)
+  UNION ALL
+  SELECT
+    c."id" AS conversation_id,
+    c."createdAt" AS created_at,
+    {DM_SCORE_SQL} AS match_score,
+    peer."id" AS other_user_id,
+    peer."displayName" AS other_user_name
+  FROM "Conversation" c
+  JOIN "User" peer ON peer."id" = c."dmUserAId"
+  WHERE c."type" = 'DM'
+    AND c."dmUserBId" = :user_id
+    AND (lower(peer."displayName") LIKE :like_query OR lower(peer."id") LIKE :like_query)
+),
+dms_q AS (
+  SELECT
+    'dm' AS kind,
+    conversation_id AS result_id,
+    conversation_id,
+    created_at,
+    max(match_score) AS match_score,
+    NULL AS channel_name,
+    NULL AS channel_slug,
+    other_user_id,
+    other_user_name,
+    NULL AS sender_name,
+    NULL AS body,
+    NULL AS body_offset,
+    NULL AS body_length,
+    NULL AS conversation_type
+  FROM dm_candidates
+  GROUP BY other_user_id
+  ORDER BY match_score DESC, created_at DESC
+  LIMIT :dm_limit
+),
+messages_q AS (
+  SELECT
+    'message' AS kind,
+    m."id" AS result_id,
+    m."conversationId" AS conversation_id,
+    m."createdAt" AS created_at,
+    {message_score} AS match_score,
+    ch."name" AS channel_name,
+    ch."slug" AS channel_slug,
+    peer."id" AS other_user_id,
+    peer."displayName" AS other_user_name,
+    sender."displayName" AS sender_name,
+    substr(m."body", max(1, instr(lower(m."body"), :needle) - :snippet_radius), :snippet_span) AS body,
+    max(0, instr(lower(m."body"), :needle) - 1 - :snippet_radius) AS body_offset,
+    length(m."body") AS body_length,
+    c."type" AS conversation_type
+  {message_source}
+  ORDER BY match_score DESC, created_at DESC
+  LIMIT :message_limit
+),
+ranked AS (
+  SELECT *, match_score + 50 AS score FROM channels_q
+  UNION ALL
+  SELECT *, match_score + 44 AS score FROM dms_q
+  UNION ALL
+  SELECT *, match_score + 30 AS score FROM messages_q
+)
+SELECT *
+FROM ranked
+WHERE match_score > 0
+ORDER BY score DESC, created_at DESC
+LIMIT :limit
+'''
+
+
+SEARCH_SQL_BY_MODE = {mode: _build_search_sql(mode) for mode in ("fts", "like", "like-short")}
+
+logger = logging.getLogger("openwork.chatindex")
+
+_bootstrap_lock = Lock()
+_fts_sync_lock = Lock()
+_bootstrapped = False
+# None until the first successful sync; False only once FTS5 is known to be
+# missing from this SQLite build.
+_fts_ready: Optional[bool] = None
+_connection_pool: "Queue[sqlite3.Connection]" = Queue(maxsize=CONNECTION_POOL_SIZE)
+
 
 class ChatSearchRequest(BaseModel):
     query: str
@@ -25,288 +245,275 @@ class ChatSearchRequest(BaseModel):
     limit: Optional[int] = None
 
 
-def _connect_database() -> sqlite3.Connection:
+@dataclass(slots=True)
+class SearchResult:
+    kind: str
+    id: str
+    score: int
+    title: str
+    subtitle: str
+    snippet: Optional[str]
+    createdAt: str
+    conversationId: str
+    threadKind: str
+    channelSlug: Optional[str] = None
+    channelName: Optional[str] = None
+    otherUserId: Optional[str] = None
+    otherUserName: Optional[str] = None
+    messageId: Optional[str] = None
+
+
+class ChatConnection(sqlite3.Connection):
+    fts_index_path: Optional[Path] = None
+    fts_attached = False
+    synced_data_version: Optional[int] = None
+
+
+def _connect_database() -> ChatConnection:
     database_path = resolve_database_path()
     if not database_path.exists():
         raise FileNotFoundError(f"Database file not found: {database_path}")
 
-    connection = sqlite3.connect(str(database_path))
+    connection = sqlite3.connect(
+        str(database_path),
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=ChatConnection,
+    )
     connection.row_factory = sqlite3.Row
+    connection.fts_index_path = resolve_fts_index_path(database_path)
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
+    _bootstrap_database(connection)
     return connection
 
 
+@contextmanager
+def get_connection() -> Iterator[ChatConnection]:
+    try:
+        connection = _connection_pool.get_nowait()
+    except Empty:
+        connection = _connect_database()
+
+    try:
+        yield connection
+    finally:
+        try:
+            _connection_pool.put_nowait(connection)
+        except Full:
+            connection.close()
+
+
+def _close_connection_pool() -> None:
+    while True:
+        try:
+            connection = _connection_pool.get_nowait()
+        except Empty:
+            return
+        connection.close()
+
+
+def _bootstrap_database(connection: ChatConnection) -> None:
+    global _bootstrapped
+    if _bootstrapped:
+        return
+
+    with _bootstrap_lock:
+        if _bootstrapped:
+            return
+        try:
+            drop_legacy_fts_objects(connection)
+        except sqlite3.Error as exc:
+            connection.rollback()
+            logger.warning("Could not drop legacy FTS tables from the chat database: %s", exc)
+        _bootstrapped = True
+
+
+def _disable_fts(exc: sqlite3.Error) -> None:
+    global _fts_ready
+    _fts_ready = False
+    logger.warning("FTS5 unavailable (%s); chat search falls back to LIKE scans.", exc)
+
+
+def _prepare_fts(connection: ChatConnection) -> bool:
+    global _fts_ready
+    if _fts_ready is False or connection.fts_index_path is None:
+        return False
+
+    try:
+        if not connection.fts_attached:
+            attach_fts_index(connection, connection.fts_index_path)
+            connection.fts_attached = True
+
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        if _fts_ready and connection.synced_data_version == data_version:
+            return True
+
+        with _fts_sync_lock:
+            sync_message_fts(connection, full=not _fts_ready)
+            _fts_ready = True
+        connection.synced_data_version = data_version
+        return True
+    except sqlite3.Error as exc:
+        if is_fts5_unavailable_error(exc):
+            _disable_fts(exc)
+        else:
+            logger.warning("Chat FTS index not usable for this request; using LIKE scans: %s", exc)
+        return False
+    except OSError as exc:
+        logger.warning("Chat FTS index path not usable; using LIKE scans: %s", exc)
+        return False
+
+
+def _search_mode(use_fts: bool, needle_lower: str) -> str:
+    if use_fts:
+        return "fts"
+    if len(needle_lower) < SHORT_NEEDLE_LENGTH:
+        return "like-short"
+    return "like"
+
+
 def _require_user(connection: sqlite3.Connection, user_id: str) -> None:
-    row = connection.execute(
-        'SELECT "id" FROM "User" WHERE "id" = ? LIMIT 1',
-        (user_id,),
-    ).fetchone()
+    row = connection.execute(REQUIRE_USER_SQL, (user_id,)).fetchone()
     if row is None:
         raise HTTPException(status_code=404, detail={"errorCode": "USER_NOT_FOUND", "message": "User does not exist."})
 
 
-def _result_key(result: Dict[str, Any]) -> str:
-    kind = result["kind"]
-    if kind == "channel":
-        return f"channel:{result.get('conversationId') or result.get('channelSlug') or result.get('id')}"
-    if kind == "dm":
-        return f"dm:{result.get('otherUserId') or result.get('conversationId') or result.get('id')}"
-    return f"message:{result.get('messageId') or result.get('id')}"
+def _channel_result(row: sqlite3.Row) -> SearchResult:
+    channel_name = row["channel_name"] or "channel"
+    channel_slug = row["channel_slug"] or ""
+    return SearchResult(
+        kind="channel",
+        id=row["conversation_id"],
+        score=row["score"],
+        title=f"#{channel_name}",
+        subtitle=f"Channel · {channel_slug}",
+        snippet=None,
+        createdAt=row["created_at"],
+        conversationId=row["conversation_id"],
+        threadKind="channel",
+        channelSlug=channel_slug,
+        channelName=channel_name,
+    )
+
 
+def _dm_result(row: sqlite3.Row) -> SearchResult:
+    return SearchResult(
+        kind="dm",
+        id=row["conversation_id"],
+        score=row["score"],
+        title=row["other_user_name"],
+        subtitle="Direct message",
+        snippet=None,
+        createdAt=row["created_at"],
+        conversationId=row["conversation_id"],
+        threadKind="dm",
+        otherUserId=row["other_user_id"],
+        otherUserName=row["other_user_name"],
+    )
 
-def _dedupe_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    best_by_key: Dict[str, Dict[str, Any]] = {}
-    for result in results:
-        key = _result_key(result)
-        existing = best_by_key.get(key)
-        if existing is None or result["score"] > existing["score"]:
-            best_by_key[key] = result
-    return list(best_by_key.values())
 
+def _message_snippet(row: sqlite3.Row, needle_lower: str) -> Optional[str]:
+    window = row["body"] or ""
+    snippet = extract_search_snippet(window, needle_lower)
+    if not snippet:
+        return snippet
+    if row["body_offset"] > 0 and not snippet.startswith("…"):
+        snippet = f"…{snippet}"
+    if row["body_offset"] + len(window) < row["body_length"] and not snippet.endswith("…"):
+        snippet = f"{snippet}…"
+    return snippet
 
-def _sort_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return sorted(
-        results,
-        key=lambda item: (item["score"], sort_time_value(item.get("createdAt"))),
-        reverse=True,
-    )
 
+def _message_result(row: sqlite3.Row, needle_lower: str) -> SearchResult:
+    message_id = row["result_id"]
+    snippet = _message_snippet(row, needle_lower)
 
-def _search_channels(
-    connection: sqlite3.Connection,
-    query: str,
-    needle_lower: str,
-    limit: int,
-) -> List[Dict[str, Any]]:
-    like_query = f"%{query.lower()}%"
-    rows = connection.execute(
-        '''
-        SELECT
-          c."id" AS conversation_id,
-          c."createdAt" AS created_at,
-          ch."name" AS channel_name,
-          ch."slug" AS channel_slug
-        FROM "Conversation" c
-        JOIN "Channel" ch ON ch."id" = c."channelId"
-        WHERE c."type" = 'CHANNEL'
-          AND (lower(ch."name") LIKE ? OR lower(ch."slug") LIKE ?)
-        ORDER BY c."createdAt" DESC
-        LIMIT ?
-        ''',
-        (like_query, like_query, limit),
-    ).fetchall()
-
-    results: List[Dict[str, Any]] = []
-    for row in rows:
+    if row["conversation_type"] == "CHANNEL":
         channel_name = row["channel_name"] or "channel"
         channel_slug = row["channel_slug"] or ""
-        score = max(
-            score_text_match(channel_name, needle_lower),
-            score_text_match(channel_slug, needle_lower),
+        return SearchResult(
+            kind="message",
+            id=message_id,
+            score=row["score"],
+            title=f"{row['sender_name']} in #{channel_name}",
+            subtitle="Channel message",
+            snippet=snippet,
+            createdAt=row["created_at"],
+            conversationId=row["conversation_id"],
+            threadKind="channel",
+            channelSlug=channel_slug,
+            channelName=channel_name,
+            messageId=message_id,
         )
 
-        results.append(
-            {
-                "kind": "channel",
-                "id": row["conversation_id"],
-                "score": score + 50,
-                "title": f"#{channel_name}",
-                "subtitle": f"Channel · {channel_slug}",
-                "snippet": None,
-                "createdAt": row["created_at"],
-                "conversationId": row["conversation_id"],
-                "threadKind": "channel",
-                "channelSlug": channel_slug,
-                "channelName": channel_name,
-                "otherUserId": None,
-                "otherUserName": None,
-                "messageId": None,
-            }
-        )
-
-    return results
+    other_user_name = row["other_user_name"]
+    return SearchResult(
+        kind="message",
+        id=message_id,
+        score=row["score"],
+        title=f"{row['sender_name']} in DM with {other_user_name or 'DM'}",
+        subtitle="Direct message",
+        snippet=snippet,
+        createdAt=row["created_at"],
+        conversationId=row["conversation_id"],
+        threadKind="dm",
+        otherUserId=row["other_user_id"],
+        otherUserName=other_user_name,
+        messageId=message_id,
+    )
 
 
-def _search_dms(
-    connection: sqlite3.Connection,
+def _search_all(
+    connection: ChatConnection,
     user_id: str,
     needle_lower: str,
-    limit: int,
-) -> List[Dict[str, Any]]:
-    rows = connection.execute(
-        '''
-        SELECT
-          c."id" AS conversation_id,
-          c."createdAt" AS created_at,
-          c."dmUserAId" AS dm_user_a_id,
-          c."dmUserBId" AS dm_user_b_id,
-          ua."id" AS user_a_id,
-          ua."displayName" AS user_a_name,
-          ub."id" AS user_b_id,
-          ub."displayName" AS user_b_name
-        FROM "Conversation" c
-        LEFT JOIN "User" ua ON ua."id" = c."dmUserAId"
-        LEFT JOIN "User" ub ON ub."id" = c."dmUserBId"
-        WHERE c."type" = 'DM'
-          AND (c."dmUserAId" = ? OR c."dmUserBId" = ?)
-        LIMIT 500
-        ''',
-        (user_id, user_id),
-    ).fetchall()
-
-    results: List[Dict[str, Any]] = []
-    for row in rows:
-        if row["dm_user_a_id"] == user_id:
-            other_user_id = row["user_b_id"]
-            other_user_name = row["user_b_name"]
-        elif row["dm_user_b_id"] == user_id:
-            other_user_id = row["user_a_id"]
-            other_user_name = row["user_a_name"]
+    like_pattern: str,
+    fts_query: Optional[str],
+    limits: Dict[str, int],
+) -> List[SearchResult]:
+    params = {
+        "user_id": user_id,
+        "needle": needle_lower,
+        "fts_query": fts_query,
+        "like_query": like_pattern,
+        "prefix_query": f"{needle_lower}%",
+        "word_prefix_query": f"% {needle_lower}%",
+        "snippet_radius": SNIPPET_WINDOW_RADIUS,
+        "snippet_span": 2 * SNIPPET_WINDOW_RADIUS + len(needle_lower),
+        **limits,
+    }
+    use_fts = bool(fts_query) and _prepare_fts(connection)
+    sql = SEARCH_SQL_BY_MODE[_search_mode(use_fts, needle_lower)]
+
+    results: List[SearchResult] = []
+    for row in connection.execute(sql, params):
+        kind = row["kind"]
+        if kind == "channel":
+            results.append(_channel_result(row))
+        elif kind == "dm":
+            results.append(_dm_result(row))
         else:
-            continue
-
-        if not other_user_id or not other_user_name:
-            continue
-
-        score = max(
-            score_text_match(other_user_name, needle_lower),
-            score_text_match(other_user_id, needle_lower),
-        )
-        if score == 0:
-            continue
-
-        results.append(
-            {
-                "kind": "dm",
-                "id": row["conversation_id"],
-                "score": score + 44,
-                "title": other_user_name,
-                "subtitle": "Direct message",
-                "snippet": None,
-                "createdAt": row["created_at"],
-                "conversationId": row["conversation_id"],
-                "threadKind": "dm",
-                "channelSlug": None,
-                "channelName": None,
-                "otherUserId": other_user_id,
-                "otherUserName": other_user_name,
-                "messageId": None,
-            }
-        )
-
-        if len(results) >= limit:
-            break
+            results.append(_message_result(row, needle_lower))
 
     return results
 
 
-def _search_messages(
-    connection: sqlite3.Connection,
-    user_id: str,
-    query: str,
-    needle_lower: str,
-    limit: int,
-) -> List[Dict[str, Any]]:
-    like_query = f"%{query.lower()}%"
-    rows = connection.execute(
-        '''
-        SELECT
-          m."id" AS message_id,
-          m."conversationId" AS conversation_id,
-          m."body" AS body,
-          m."createdAt" AS created_at,
-          sender."displayName" AS sender_name,
-          c."type" AS conversation_type,
-          ch."name" AS channel_name,
-          ch."slug" AS channel_slug,
-          c."dmUserAId" AS dm_user_a_id,
-          c."dmUserBId" AS dm_user_b_id,
-          ua."id" AS user_a_id,
-          ua."displayName" AS user_a_name,
-          ub."id" AS user_b_id,
-          ub."displayName" AS user_b_name
-        FROM "Message" m
-        JOIN "Conversation" c ON c."id" = m."conversationId"
-        JOIN "User" sender ON sender."id" = m."senderId"
-        LEFT JOIN "Channel" ch ON ch."id" = c."channelId"
-        LEFT JOIN "User" ua ON ua."id" = c."dmUserAId"
-        LEFT JOIN "User" ub ON ub."id" = c."dmUserBId"
-        WHERE lower(m."body") LIKE ?
-          AND (
-            c."type" = 'CHANNEL'
-            OR (
-              c."type" = 'DM'
-              AND (c."dmUserAId" = ? OR c."dmUserBId" = ?)
-            )
-          )
-        ORDER BY m."createdAt" DESC
-        LIMIT ?
-        ''',
-        (like_query, user_id, user_id, limit),
-    ).fetchall()
-
-    results: List[Dict[str, Any]] = []
-    for row in rows:
-        body = row["body"] or ""
-        body_score = score_text_match(body, needle_lower)
-        if body_score == 0:
-            continue
-
-        created_at = row["created_at"]
-        snippet = extract_search_snippet(body, needle_lower)
-
-        if row["conversation_type"] == "CHANNEL":
-            channel_name = row["channel_name"] or "channel"
-            channel_slug = row["channel_slug"] or ""
-            results.append(
-                {
-                    "kind": "message",
-                    "id": row["message_id"],
-                    "score": body_score + 30,
-                    "title": f"{row['sender_name']} in #{channel_name}",
-                    "subtitle": "Channel message",
-                    "snippet": snippet,
-                    "createdAt": created_at,
-                    "conversationId": row["conversation_id"],
-                    "threadKind": "channel",
-                    "channelSlug": channel_slug,
-                    "channelName": channel_name,
-                    "otherUserId": None,
-                    "otherUserName": None,
-                    "messageId": row["message_id"],
-                }
-            )
-            continue
-
-        if row["dm_user_a_id"] == user_id:
-            other_user_id = row["user_b_id"]
-            other_user_name = row["user_b_name"]
-        elif row["dm_user_b_id"] == user_id:
-            other_user_id = row["user_a_id"]
-            other_user_name = row["user_a_name"]
-        else:
-            other_user_id = None
-            other_user_name = None
-
-        results.append(
-            {
-                "kind": "message",
-                "id": row["message_id"],
-                "score": body_score + 30,
-                "title": f"{row['sender_name']} in DM with {other_user_name or 'DM'}",
-                "subtitle": "Direct message",
-                "snippet": snippet,
-                "createdAt": created_at,
-                "conversationId": row["conversation_id"],
-                "threadKind": "dm",
-                "channelSlug": None,
-                "channelName": None,
-                "otherUserId": other_user_id,
-                "otherUserName": other_user_name,
-                "messageId": row["message_id"],
-            }
-        )
+@app.on_event("startup")
+def _warm_connection_pool() -> None:
+    try:
+        while not _connection_pool.full():
+            _connection_pool.put_nowait(_connect_database())
+    except FileNotFoundError as exc:
+        logger.warning("ChatIndex connection pool not warmed: %s", exc)
+    except Full:
+        pass
 
-    return results
+
+@app.on_event("shutdown")
+def _shutdown_connection_pool() -> None:
+    _close_connection_pool()
 
 
 @app.get("/health")
@@ -335,33 +542,29 @@ def search(payload: ChatSearchRequest, request: Request) -> Dict[str, Any]:
 
     limit = parse_limit(payload.limit)
     bucket = max(10, limit // 2)
-    channel_limit = min(10, max(4, bucket // 3))
-    dm_limit = min(10, max(4, bucket // 4))
-    message_limit = max(10, int(bucket * 1.8))
+    limits = {
+        "limit": limit,
+        "channel_limit": min(10, max(4, bucket // 3)),
+        "dm_limit": min(10, max(4, bucket // 4)),
+        "message_limit": max(10, int(bucket * 1.8)),
+    }
     needle_lower = query.lower()
+    like_pattern = f"%{needle_lower}%"
+    fts_query = build_fts_prefix_query(needle_lower)
 
     try:
-        connection = _connect_database()
+        with get_connection() as connection:
+            _require_user(connection, user_id)
+            merged = _search_all(connection, user_id, needle_lower, like_pattern, fts_query, limits)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=503,
             detail={"errorCode": "DB_NOT_FOUND", "message": str(exc)},
         ) from exc
 
-    try:
-        _require_user(connection, user_id)
-
-        channels = _search_channels(connection, query, needle_lower, channel_limit)
-        dms = _search_dms(connection, user_id, needle_lower, dm_limit)
-        messages = _search_messages(connection, user_id, query, needle_lower, message_limit)
-
-        merged = _sort_results(_dedupe_results([*channels, *dms, *messages]))[:limit]
-
-        return {
-            "query": query,
-            "total": len(merged),
-            "tookMs": int((time.perf_counter() - started_at) * 1000),
-            "results": merged,
-        }
-    finally:
-        connection.close()
+    return {
+        "query": query,
+        "total": len(merged),
+        "tookMs": int((time.perf_counter() - started_at) * 1000),
+        "results": [asdict(result) for result in merged],
+    }
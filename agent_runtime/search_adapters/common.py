@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
 import os
 import re
-from datetime import datetime
+import sqlite3
+import zlib
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -11,9 +15,51 @@ MAX_LIMIT = 100
 MIN_QUERY_LENGTH = 2
 MAX_QUERY_LENGTH = 180
 
+FTS_SCORE_BASE = 120
+FTS_SCORE_SPAN = 60
+FTS_RANK_SCALE = 8
+
+FTS_TOKEN_PATTERN = re.compile(r"\w+")
+
+# The message FTS index lives in a separate SQLite file attached as "search",
+# so the Prisma-managed database never gains tables or triggers it does not
+# know about. Documents are keyed on Message.id (rowids of TEXT primary key
+# tables are not stable across VACUUM or table redefinitions).
+FTS_SCHEMA = "search"
+FTS_INDEX_STATEMENTS = (
+    'CREATE TABLE IF NOT EXISTS search."message_doc" ('
+    '"docid" INTEGER PRIMARY KEY, "message_id" TEXT NOT NULL UNIQUE)',
+    'CREATE VIRTUAL TABLE IF NOT EXISTS search."message_search" USING fts5(body, tokenize=\'unicode61\')',
+    'CREATE TABLE IF NOT EXISTS search."sync_state" ('
+    '"id" INTEGER PRIMARY KEY CHECK ("id" = 1), "message_count" INTEGER NOT NULL, "max_rowid" INTEGER NOT NULL)',
+)
+
+# Objects earlier versions created inside the chat database itself; the
+# triggers break the app's own writes once Prisma drops the FTS tables.
+LEGACY_FTS_TRIGGERS = tuple(
+    f"{table}_fts_{suffix}" for table in ("Message", "Channel") for suffix in ("ai", "ad", "au")
+)
+LEGACY_FTS_TABLES = ("Message_fts", "Channel_fts")
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
+def decode_content(body: bytes, content_encoding: Optional[str]) -> bytes:
+    encoding = (content_encoding or "").strip().lower()
+    try:
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                # Some servers send raw deflate streams without the zlib header.
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+    except (OSError, EOFError, zlib.error) as exc:
+        raise ValueError(f"Invalid {encoding} response body: {exc}") from exc
+    return body
+
+
 def parse_query(raw_query: str) -> str:
     query = (raw_query or "").strip()
     if not query:
@@ -30,28 +76,40 @@ def parse_limit(raw_limit: Optional[int]) -> int:
 
 
 def score_text_match(haystack: str, needle_lower: str) -> int:
-    if not haystack:
+    if not haystack or len(haystack) < len(needle_lower):
         return 0
+    return score_lowered_text_match(haystack.lower(), needle_lower)
 
-    value = haystack.lower()
-    if value == needle_lower:
-        return 220
-    if value.startswith(needle_lower):
-        return 170
 
+def score_lowered_text_match(value: str, needle_lower: str) -> int:
+    # Same as score_text_match for callers that already hold haystack.lower().
     index = value.find(needle_lower)
     if index == -1:
         return 0
+    if index == 0:
+        return 220 if len(value) == len(needle_lower) else 170
 
-    early_bonus = max(0, 40 - (index // 4))
+    early_bonus = max(0, 40 - (index >> 2))
     return 120 + early_bonus
 
 
+def text_match_score_sql(column: str, needle_param: str = ":needle") -> str:
+    # SQL twin of score_text_match for ASCII text; needle_param must already be lowercased.
+    position = f"instr(lower({column}), {needle_param})"
+    return (
+        f"(CASE"
+        f" WHEN lower({column}) = {needle_param} THEN 220"
+        f" WHEN {position} = 1 THEN 170"
+        f" WHEN {position} > 1 THEN 120 + max(0, 40 - ({position} - 1) / 4)"
+        f" ELSE 0 END)"
+    )
+
+
 def extract_search_snippet(text: str, needle_lower: str, radius: int = 90) -> Optional[str]:
     if not text:
         return None
 
-    normalized = re.sub(r"\s+", " ", text).strip()
+    normalized = " ".join(text.split())
     if not normalized:
         return None
 
@@ -69,23 +127,144 @@ def extract_search_snippet(text: str, needle_lower: str, radius: int = 90) -> Op
     return f"{prefix}{snippet}{suffix}"
 
 
-def sort_time_value(raw_value: Optional[str]) -> float:
-    if not raw_value:
-        return 0.0
+def build_fts_prefix_query(query: str) -> Optional[str]:
+    tokens = FTS_TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def fts_rank_score_sql(fts_table: str) -> str:
+    # bm25() is negative with better matches further below zero; map it onto the
+    # same band score_text_match uses for a contained (non-prefix) match.
+    return (
+        f'({FTS_SCORE_BASE} + min({FTS_SCORE_SPAN}, '
+        f'CAST(-{FTS_RANK_SCALE} * bm25("{fts_table}") AS INTEGER)))'
+    )
+
+
+def is_fts5_unavailable_error(exc: sqlite3.Error) -> bool:
+    return "no such module: fts5" in str(exc).lower()
+
+
+def drop_legacy_fts_objects(connection: sqlite3.Connection) -> None:
+    names = LEGACY_FTS_TRIGGERS + LEGACY_FTS_TABLES
+    placeholders = ", ".join("?" for _ in names)
+    existing = {
+        (row[0], row[1])
+        for row in connection.execute(
+            f"SELECT type, name FROM main.sqlite_master WHERE name IN ({placeholders})",
+            names,
+        )
+    }
+    if not existing:
+        return
 
-    value = raw_value.strip()
-    if not value:
-        return 0.0
+    # Triggers first: dropping a table does not drop triggers that merely
+    # reference it from their body.
+    for name in LEGACY_FTS_TRIGGERS:
+        if ("trigger", name) in existing:
+            connection.execute(f'DROP TRIGGER IF EXISTS main."{name}"')
+    for name in LEGACY_FTS_TABLES:
+        if ("table", name) in existing:
+            connection.execute(f'DROP TABLE IF EXISTS main."{name}"')
+    connection.commit()
 
+
+def resolve_fts_index_path(database_path: Path) -> Path:
+    raw = (os.getenv("CHATINDEX_FTS_PATH") or "").strip()
+    if raw:
+        return Path(raw).expanduser()
+    digest = hashlib.sha1(os.fspath(database_path).encode("utf-8")).hexdigest()[:16]
+    return Path.home() / ".cache" / "openwork" / "chatindex" / f"{digest}.sqlite3"
+
+
+def attach_fts_index(connection: sqlite3.Connection, index_path: Path) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    connection.execute(f"ATTACH DATABASE ? AS {FTS_SCHEMA}", (os.fspath(index_path),))
+    try:
+        connection.execute(f"PRAGMA {FTS_SCHEMA}.journal_mode=WAL")
+        connection.execute(f"PRAGMA {FTS_SCHEMA}.synchronous=NORMAL")
+        for statement in FTS_INDEX_STATEMENTS:
+            connection.execute(statement)
+    except sqlite3.Error:
+        connection.execute(f"DETACH DATABASE {FTS_SCHEMA}")
+        raise
+
+
+def sync_message_fts(connection: sqlite3.Connection, full: bool) -> None:
+    # Messages are append-only in the app, so the usual change is new rows past
+    # the last synced rowid. Anything else (deletes, VACUUM renumbering, a
+    # rebuilt database) shows up as a count mismatch and falls back to a full
+    # reconcile by message id; full=True forces that reconcile.
+    message_count, max_rowid = connection.execute(
+        'SELECT count(*), coalesce(max(rowid), 0) FROM main."Message"'
+    ).fetchone()
+    state = connection.execute(
+        'SELECT "message_count", "max_rowid" FROM search."sync_state" WHERE "id" = 1'
+    ).fetchone()
+    if not full and state is not None and tuple(state) == (message_count, max_rowid):
+        return
+
+    connection.execute("BEGIN")
     try:
-        candidate = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(candidate).timestamp()
-    except ValueError:
-        return 0.0
+        reconciled = False
+        if not full and state is not None:
+            _index_missing_messages(connection, min_rowid=state[1])
+            reconciled = _indexed_message_count(connection) == message_count
+        if not reconciled:
+            connection.execute(
+                'DELETE FROM search."message_search" WHERE rowid IN ('
+                'SELECT d."docid" FROM search."message_doc" d '
+                'WHERE NOT EXISTS (SELECT 1 FROM main."Message" m WHERE m."id" = d."message_id"))'
+            )
+            connection.execute(
+                'DELETE FROM search."message_doc" '
+                'WHERE NOT EXISTS (SELECT 1 FROM main."Message" m WHERE m."id" = search."message_doc"."message_id")'
+            )
+            _index_missing_messages(connection, min_rowid=None)
+
+        connection.execute(
+            'INSERT OR REPLACE INTO search."sync_state" ("id", "message_count", "max_rowid") VALUES (1, ?, ?)',
+            (message_count, max_rowid),
+        )
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+
+
+def _indexed_message_count(connection: sqlite3.Connection) -> int:
+    return connection.execute('SELECT count(*) FROM search."message_doc"').fetchone()[0]
+
+
+def _index_missing_messages(connection: sqlite3.Connection, min_rowid: Optional[int]) -> None:
+    previous_max_docid = connection.execute(
+        'SELECT coalesce(max("docid"), 0) FROM search."message_doc"'
+    ).fetchone()[0]
+    rowid_filter = "AND m.rowid > :min_rowid" if min_rowid is not None else ""
+    connection.execute(
+        'INSERT INTO search."message_doc" ("message_id") '
+        'SELECT m."id" FROM main."Message" m '
+        'WHERE NOT EXISTS (SELECT 1 FROM search."message_doc" d WHERE d."message_id" = m."id") '
+        f"{rowid_filter} ORDER BY m.rowid",
+        {"min_rowid": min_rowid},
+    )
+    connection.execute(
+        'INSERT INTO search."message_search" (rowid, body) '
+        'SELECT d."docid", m."body" FROM search."message_doc" d '
+        'JOIN main."Message" m ON m."id" = d."message_id" '
+        'WHERE d."docid" > ?',
+        (previous_max_docid,),
+    )
 
 
 def resolve_database_path() -> Path:
-    database_url = (os.getenv("DATABASE_URL") or "file:./prisma/dev.db").strip()
+    return _resolve_database_url((os.getenv("DATABASE_URL") or "file:./prisma/dev.db").strip())
+
+
+@lru_cache(maxsize=8)
+def _resolve_database_url(database_url: str) -> Path:
     if database_url.startswith("file:"):
         raw_path = database_url[5:].split("?", 1)[0]
     else:
@@ -103,7 +282,11 @@ def resolve_database_path() -> Path:
 
 
 def resolve_workspace_root() -> Path:
-    configured_root = (os.getenv("WORKSPACE_FILES_ROOT") or "").strip()
+    return _resolve_workspace_root((os.getenv("WORKSPACE_FILES_ROOT") or "").strip())
+
+
+@lru_cache(maxsize=8)
+def _resolve_workspace_root(configured_root: str) -> Path:
     if not configured_root:
         return (REPO_ROOT / "company_files").resolve()
 
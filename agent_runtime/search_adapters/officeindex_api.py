@@ -1,23 +1,42 @@
 from __future__ import annotations
 
-import base64
 import hashlib
+import io
 import json
 import logging
+import multiprocessing
 import os
+import sqlite3
 import time
 import zipfile
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
+from http.client import HTTPConnection, HTTPException as HTTPClientError, HTTPSConnection
+from queue import Empty, Full, Queue
 from threading import Event, Lock, Thread
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from typing import Any, BinaryIO, Deque, Dict, List, Literal, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlsplit
 from xml.etree import ElementTree
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
+try:
+    import pybase64 as base64_codec
+except ImportError:
+    import base64 as base64_codec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .common import (
+    decode_content,
     extract_search_snippet,
     parse_limit,
     parse_query,
@@ -33,13 +52,23 @@ MAX_BINARY_FILE_BYTES = 16_000_000
 MAX_XML_MEMBER_BYTES = 3_000_000
 MAX_EXTRACTED_TEXT_CHARS = 160_000
 MAX_DIAGNOSTIC_MESSAGES = 50
+# Single-term queries may match inside a token, which needs a vocabulary scan;
+# past this many tokens the per-document substring check is used instead.
+MAX_INFIX_SCAN_TOKENS = 50_000
+FILE_FAILURE_OUTCOMES = frozenset({"file-stat-failed", "file-hash-failed", "file-extract-failed"})
 HASH_CHUNK_BYTES = 1_048_576
+XML_FEED_CHUNK_BYTES = 65_536
+DEFAULT_HASH_ALGORITHM = "sha256"
+PROCESS_POOL_MIN_FILES = 8
 
 DEFAULT_REFRESH_INTERVAL_SECONDS = 25
 DEFAULT_HTTP_TIMEOUT_SECONDS = 8
+OPENSEARCH_POOL_SIZE = 32
 
 OFFICE_FILE_EXTENSIONS = {".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx"}
 OOXML_EXTENSIONS = {".docx", ".pptx", ".xlsx"}
+OOXML_PART_PREFIXES = {".docx": ("word/",), ".pptx": ("ppt/",), ".xlsx": ("xl/",)}
+OOXML_TEXT_TAGS = frozenset({"t", "v", "p", "a:t", "is", "si"})
 
 EXCLUDED_DIRECTORY_NAMES = {
     ".git",
@@ -52,6 +81,27 @@ EXCLUDED_DIRECTORY_NAMES = {
     ".cache",
 }
 
+INDEX_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS office_index (
+  workspace_root TEXT NOT NULL,
+  file_path TEXT NOT NULL,
+  doc BLOB NOT NULL,
+  PRIMARY KEY (workspace_root, file_path)
+)
+"""
+INDEX_CACHE_DISABLED_VALUES = {"0", "false", "no", "off", "none"}
+# Derived fields (normalizedContent, stemLower) are rebuilt on load.
+PERSISTED_DOC_FIELDS = (
+    "filePath",
+    "title",
+    "subtitle",
+    "content",
+    "sourceMeta",
+    "mtimeNs",
+    "sizeBytes",
+    "contentHash",
+)
+
 RefreshMode = Literal["full", "incremental"]
 
 logger = logging.getLogger("openwork.officeindex")
@@ -66,17 +116,71 @@ class OfficeReindexRequest(BaseModel):
     mode: Optional[str] = None
 
 
+class OpenSearchConfig(NamedTuple):
+    endpoint: str
+    pipeline: str
+    headers: Dict[str, str]
+    timeout: int
+
+
+# Whitespace token -> paths whose normalized content contains it, plus the
+# vocabulary sorted forwards and reversed for prefix/suffix bisection.
+class TokenIndex(NamedTuple):
+    postings: Dict[str, Tuple[str, ...]]
+    sorted_tokens: List[str]
+    sorted_reversed_tokens: List[str]
+
+
+EMPTY_TOKEN_INDEX = TokenIndex(postings={}, sorted_tokens=[], sorted_reversed_tokens=[])
+
+
+# One file to hash/extract. Only the previous content hash travels to the
+# worker; the caller merges "reused" outcomes into the existing doc.
+class IndexJob(NamedTuple):
+    relative_path: str
+    absolute_path: str
+    size_bytes: int
+    mtime_ns: int
+    previously_indexed: bool
+    previous_hash: Optional[str]
+
+
 _index_lock = Lock()
 _refresh_lock = Lock()
+# Published index dicts are never mutated; refreshes build a new one and
+# rebind it, so readers only hold _index_lock to grab the references.
 _index_by_path: Dict[str, Dict[str, Any]] = {}
+_token_index: TokenIndex = EMPTY_TOKEN_INDEX
 _last_indexed_at: float = 0.0
 _last_refresh_mode: str = "none"
 _last_refresh_summary: Dict[str, Any] = {}
 _last_refresh_error: Optional[str] = None
+_last_refresh_monotonic: float = 0.0
+# Workspace-relative path -> (absolute path, (mtime_ns, size) when it failed,
+# or None if it could not be stat'ed). Drives the search "degraded" flag.
+_failed_files: Dict[str, Tuple[str, Optional[Tuple[int, int]]]] = {}
+
+# /search never refreshes inline once an index exists: a due refresh is
+# handed to this single worker and the current snapshot is served meanwhile.
+_search_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="officeindex-refresh")
+_search_refresh_lock = Lock()
+_search_refresh_future: Optional["Future[None]"] = None
+
+_index_cache_loaded_root: Optional[str] = None
+
+# Created on first use and kept for the life of the app. Workers come from a
+# forkserver (or spawn) context, never a fork of the threaded server process.
+_extract_process_pool: Optional[ProcessPoolExecutor] = None
+_extract_process_pool_workers = 0
+_extract_process_pool_lock = Lock()
 
 _background_stop = Event()
 _background_thread: Optional[Thread] = None
 
+# Keep-alive connections to OpenSearch, tagged with the origin/timeout they
+# were opened for so a config change never reuses a stale socket.
+_opensearch_pool: "Queue[Tuple[str, HTTPConnection]]" = Queue(maxsize=OPENSEARCH_POOL_SIZE)
+
 
 def _refresh_interval_seconds() -> int:
     raw = (os.getenv("OFFICEINDEX_REFRESH_INTERVAL_SECONDS") or "").strip()
@@ -111,11 +215,47 @@ def _extract_timeout_seconds() -> int:
         return DEFAULT_HTTP_TIMEOUT_SECONDS
 
 
+def _extract_worker_count() -> int:
+    default = max(4, (os.cpu_count() or 4) // 2)
+    raw = (os.getenv("OFFICEINDEX_EXTRACT_WORKERS") or "").strip()
+    if not raw:
+        return default
+
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+@lru_cache(maxsize=1)
+def _hash_algorithm() -> str:
+    raw = (os.getenv("OFFICEINDEX_HASH") or "").strip().lower()
+    if not raw:
+        return DEFAULT_HASH_ALGORITHM
+
+    try:
+        hashlib.new(raw).hexdigest()
+    except (ValueError, TypeError):
+        logger.warning("Unsupported OFFICEINDEX_HASH=%s; using %s.", raw, DEFAULT_HASH_ALGORITHM)
+        return DEFAULT_HASH_ALGORITHM
+    return raw
+
+
+@lru_cache(maxsize=1)
 def _include_pdf_files() -> bool:
     raw = (os.getenv("OFFICEINDEX_INCLUDE_PDF") or "").strip().lower()
     return raw in {"1", "true", "yes", "on"}
 
 
+def _index_cache_path() -> Optional[Path]:
+    raw = (os.getenv("OFFICEINDEX_CACHE_PATH") or "").strip()
+    if raw.lower() in INDEX_CACHE_DISABLED_VALUES:
+        return None
+    if not raw:
+        return Path.home() / ".cache" / "openwork" / "officeindex" / "index.sqlite3"
+    return Path(raw).expanduser()
+
+
 def _parse_reindex_mode(raw_mode: Optional[str], default: RefreshMode) -> RefreshMode:
     value = (raw_mode or "").strip().lower()
     if not value:
@@ -140,13 +280,6 @@ def _normalize_whitespace(value: str) -> str:
     return " ".join((value or "").split())
 
 
-def _relative_file_path(root: Path, file_path: Path) -> Optional[str]:
-    try:
-        return file_path.relative_to(root).as_posix()
-    except ValueError:
-        return None
-
-
 def _is_included_directory(name: str) -> bool:
     normalized = name.lower()
     if normalized.startswith("."):
@@ -154,66 +287,104 @@ def _is_included_directory(name: str) -> bool:
     return normalized not in EXCLUDED_DIRECTORY_NAMES
 
 
-def _is_office_candidate(path_value: Path) -> bool:
-    extension = path_value.suffix.lower()
+def _is_office_candidate(file_name: str) -> bool:
+    extension = os.path.splitext(file_name)[1].lower()
     if extension in OFFICE_FILE_EXTENSIONS:
         return True
     return extension == ".pdf" and _include_pdf_files()
 
 
-def _extract_text_from_xml(xml_bytes: bytes) -> str:
+class _XmlTextCollector:
+    # ElementTree parser target: keeps each element's own text (never tails)
+    # without building a tree. An element's text ends at its first child or
+    # its end tag, so chunks come out in document order.
+    def __init__(self, char_budget: int) -> None:
+        self.chunks: List[str] = []
+        self.joined_length = 0
+        self._char_budget = char_budget
+        self._tags: List[str] = []
+        self._buffer: List[str] = []
+        self._collecting = False
+        self._text_tag_cache: Dict[str, bool] = {}
+
+    def _flush(self) -> None:
+        self._collecting = False
+        text = "".join(self._buffer).strip()
+        self._buffer.clear()
+        if not text:
+            return
+
+        tag = self._tags[-1]
+        is_text_tag = self._text_tag_cache.get(tag)
+        if is_text_tag is None:
+            is_text_tag = tag.rsplit("}", 1)[-1].lower() in OOXML_TEXT_TAGS
+            self._text_tag_cache[tag] = is_text_tag
+        if (is_text_tag or len(text) > 2) and not self.budget_spent:
+            self.joined_length += len(text) + (1 if self.chunks else 0)
+            self.chunks.append(text)
+
+    @property
+    def budget_spent(self) -> bool:
+        return self.joined_length >= self._char_budget
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if self._collecting:
+            self._flush()
+        self._tags.append(tag)
+        self._collecting = True
+
+    def data(self, data: str) -> None:
+        if self._collecting:
+            self._buffer.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._collecting:
+            self._flush()
+        self._tags.pop()
+
+    def close(self) -> str:
+        return " ".join(self.chunks)
+
+
+def _extract_text_from_xml(xml_source: BinaryIO, char_budget: int = MAX_EXTRACTED_TEXT_CHARS) -> str:
+    # Stops reading once char_budget characters are collected; callers only
+    # keep that many, so the rest of the part is never decompressed or parsed.
+    collector = _XmlTextCollector(char_budget)
+    parser = ElementTree.XMLParser(target=collector)
     try:
-        root = ElementTree.fromstring(xml_bytes)
+        while not collector.budget_spent:
+            block = xml_source.read(XML_FEED_CHUNK_BYTES)
+            if not block:
+                return parser.close()
+            parser.feed(block)
     except ElementTree.ParseError:
         return ""
+    return " ".join(collector.chunks)
 
-    chunks: List[str] = []
-    for node in root.iter():
-        text = (node.text or "").strip()
-        if not text:
-            continue
-
-        tag_name = node.tag.rsplit("}", 1)[-1].lower()
-        if tag_name in {"t", "v", "p", "a:t", "is", "si"} or len(text) > 2:
-            chunks.append(text)
-
-    return " ".join(chunks)
 
-
-def _extract_ooxml_text(file_path: Path) -> str:
-    extension = file_path.suffix.lower()
-    if extension not in OOXML_EXTENSIONS:
+def _extract_ooxml_text(file_path: Path, raw_bytes: bytes) -> str:
+    prefixes = OOXML_PART_PREFIXES.get(file_path.suffix.lower())
+    if not prefixes:
         return ""
 
-    if extension == ".docx":
-        prefixes = ("word/",)
-    elif extension == ".pptx":
-        prefixes = ("ppt/",)
-    else:
-        prefixes = ("xl/",)
-
     parts: List[str] = []
     char_budget = 0
     try:
-        with zipfile.ZipFile(file_path, "r") as archive:
-            for member in archive.namelist():
-                lower_member = member.lower()
-                if not lower_member.endswith(".xml"):
-                    continue
-                if not any(lower_member.startswith(prefix) for prefix in prefixes):
+        with zipfile.ZipFile(io.BytesIO(raw_bytes), "r") as archive:
+            for info in archive.infolist():
+                lower_member = info.filename.lower()
+                if not lower_member.endswith(".xml") or not lower_member.startswith(prefixes):
                     continue
-
-                info = archive.getinfo(member)
                 if info.file_size > MAX_XML_MEMBER_BYTES:
                     continue
 
-                xml_bytes = archive.read(member)
-                xml_text = _extract_text_from_xml(xml_bytes)
+                with archive.open(info, "r") as member_stream:
+                    xml_text = _extract_text_from_xml(member_stream, MAX_EXTRACTED_TEXT_CHARS - char_budget)
                 if xml_text:
                     parts.append(xml_text)
                     char_budget += len(xml_text)
 
-                if char_budget > MAX_EXTRACTED_TEXT_CHARS:
+                if char_budget >= MAX_EXTRACTED_TEXT_CHARS:
                     break
     except (OSError, zipfile.BadZipFile, KeyError):
         return ""
@@ -244,56 +415,156 @@ def _opensearch_auth_header() -> Optional[str]:
     if not username or password is None:
         return None
 
-    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    token = base64_codec.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
     return f"Basic {token}"
 
 
-def _extract_with_opensearch(file_path: Path) -> Tuple[str, Dict[str, Any]]:
+def _checkout_opensearch_connection(pool_key: str) -> Optional[HTTPConnection]:
+    while True:
+        try:
+            key, connection = _opensearch_pool.get_nowait()
+        except Empty:
+            return None
+        if key == pool_key:
+            return connection
+        connection.close()
+
+
+def _checkin_opensearch_connection(pool_key: str, connection: HTTPConnection) -> None:
+    try:
+        _opensearch_pool.put_nowait((pool_key, connection))
+    except Full:
+        connection.close()
+
+
+def _close_opensearch_pool() -> None:
+    while True:
+        try:
+            _, connection = _opensearch_pool.get_nowait()
+        except Empty:
+            return
+        connection.close()
+
+
+def _post_to_opensearch(endpoint: str, body: bytes, headers: Dict[str, str], timeout: int) -> Tuple[int, bytes]:
+    parts = urlsplit(endpoint)
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        raise ValueError(f"Unsupported OpenSearch URL: {endpoint}")
+
+    pool_key = f"{parts.scheme}://{parts.netloc}#{timeout}"
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+    retried = False
+    while True:
+        connection = None if retried else _checkout_opensearch_connection(pool_key)
+        reused = connection is not None
+        if connection is None:
+            connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+            connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+        except (ConnectionResetError, BrokenPipeError):
+            # RemoteDisconnected is a ConnectionResetError: a pooled keep-alive
+            # socket the server closed while idle fails before any response
+            # bytes arrive, so the POST is resent once on a fresh socket.
+            # Timeouts and every other error are not retried.
+            connection.close()
+            if reused:
+                retried = True
+                continue
+            raise
+        except (OSError, HTTPClientError):
+            connection.close()
+            raise
+
+        try:
+            response_body = response.read()
+        except (OSError, HTTPClientError):
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            _checkin_opensearch_connection(pool_key, connection)
+        return response.status, decode_content(response_body, response.getheader("Content-Encoding"))
+
+
+@lru_cache(maxsize=1)
+def _opensearch_config() -> Optional[OpenSearchConfig]:
     base_url = _opensearch_base_url()
     if not base_url:
-        return "", {"extractor": "opensearch-disabled"}
+        return None
 
-    try:
-        raw_bytes = file_path.read_bytes()
-    except OSError:
-        return "", {"extractor": "opensearch-error", "reason": "read-failed"}
+    pipeline = _opensearch_pipeline_name()
+    headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+    auth_header = _opensearch_auth_header()
+    if auth_header:
+        headers["Authorization"] = auth_header
+
+    return OpenSearchConfig(
+        endpoint=f"{base_url}/_ingest/pipeline/{pipeline}/_simulate",
+        pipeline=pipeline,
+        headers=headers,
+        timeout=_extract_timeout_seconds(),
+    )
+
+
+def _clear_config_cache() -> None:
+    _hash_algorithm.cache_clear()
+    _include_pdf_files.cache_clear()
+    _opensearch_config.cache_clear()
+
+
+def _dump_json_bytes(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _load_json_bytes(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _extract_with_opensearch(file_path: Path, raw_bytes: bytes) -> Tuple[str, Dict[str, Any]]:
+    config = _opensearch_config()
+    if config is None:
+        return "", {"extractor": "opensearch-disabled"}
 
     if len(raw_bytes) > MAX_BINARY_FILE_BYTES:
         return "", {"extractor": "opensearch-skipped", "reason": "file-too-large"}
 
-    endpoint = f"{base_url}/_ingest/pipeline/{_opensearch_pipeline_name()}/_simulate"
     payload = {
         "docs": [
             {
                 "_source": {
-                    "data": base64.b64encode(raw_bytes).decode("ascii"),
+                    "data": base64_codec.b64encode(raw_bytes).decode("ascii"),
                     "resource_name": file_path.name,
                 }
             }
         ]
     }
 
-    headers = {"Content-Type": "application/json"}
-    auth_header = _opensearch_auth_header()
-    if auth_header:
-        headers["Authorization"] = auth_header
-
-    request = Request(
-        endpoint,
-        data=json.dumps(payload).encode("utf-8"),
-        headers=headers,
-        method="POST",
-    )
-
     try:
-        with urlopen(request, timeout=_extract_timeout_seconds()) as response:
-            body = response.read().decode("utf-8")
-    except (HTTPError, URLError, TimeoutError):
+        status, response_body = _post_to_opensearch(
+            config.endpoint,
+            _dump_json_bytes(payload),
+            config.headers,
+            config.timeout,
+        )
+    except (OSError, HTTPClientError, ValueError):
+        return "", {"extractor": "opensearch-error", "reason": "request-failed"}
+
+    if status >= 400:
         return "", {"extractor": "opensearch-error", "reason": "request-failed"}
 
     try:
-        decoded = json.loads(body)
-    except json.JSONDecodeError:
+        decoded = _load_json_bytes(response_body)
+    except ValueError:
         return "", {"extractor": "opensearch-error", "reason": "invalid-json"}
 
     docs = decoded.get("docs")
@@ -316,21 +587,20 @@ def _extract_with_opensearch(file_path: Path) -> Tuple[str, Dict[str, Any]]:
     if len(content) > MAX_EXTRACTED_TEXT_CHARS:
         content = content[:MAX_EXTRACTED_TEXT_CHARS]
 
-    return content, {"extractor": "opensearch", "pipeline": _opensearch_pipeline_name()}
+    return content, {"extractor": "opensearch", "pipeline": config.pipeline}
 
 
-def _extract_text_for_file(file_path: Path) -> Tuple[str, Dict[str, Any]]:
-    stats = file_path.stat()
-    if stats.st_size > MAX_BINARY_FILE_BYTES:
+def _extract_text_for_file(file_path: Path, raw_bytes: Optional[bytes]) -> Tuple[str, Dict[str, Any]]:
+    if raw_bytes is None or len(raw_bytes) > MAX_BINARY_FILE_BYTES:
         return "", {"extractor": "path-only", "reason": "file-too-large"}
 
-    opensearch_text, opensearch_meta = _extract_with_opensearch(file_path)
+    opensearch_text, opensearch_meta = _extract_with_opensearch(file_path, raw_bytes)
     if opensearch_text:
         return opensearch_text, opensearch_meta
 
     extension = file_path.suffix.lower()
     if extension in OOXML_EXTENSIONS:
-        local_text = _extract_ooxml_text(file_path)
+        local_text = _extract_ooxml_text(file_path, raw_bytes)
         if local_text:
             return local_text, {"extractor": "local-ooxml"}
 
@@ -343,17 +613,30 @@ def _extract_text_for_file(file_path: Path) -> Tuple[str, Dict[str, Any]]:
     return "", opensearch_meta
 
 
+def _contains_phrase(normalized_content: str, normalized_needle: str, padded_needle: str) -> bool:
+    # Same as padded_needle in f" {content} " without padding the content.
+    needle_length = len(normalized_needle)
+    return (
+        normalized_content == normalized_needle
+        or (normalized_content.startswith(normalized_needle) and normalized_content.startswith(" ", needle_length))
+        or (
+            normalized_content.endswith(normalized_needle)
+            and normalized_content.endswith(" ", 0, len(normalized_content) - needle_length)
+        )
+        or padded_needle in normalized_content
+    )
+
+
 def _compute_ranked_match(
     *,
     file_path: str,
     title: str,
     content: str,
-    needle_lower: str,
+    normalized_content: str,
+    stem_lower: str,
+    normalized_needle: str,
+    padded_needle: str,
 ) -> Optional[Dict[str, Any]]:
-    normalized_content = _normalize_whitespace(content).lower()
-    normalized_needle = _normalize_whitespace(needle_lower).lower()
-    stem_lower = Path(title or file_path).stem.lower()
-
     path_score = max(
         score_text_match(file_path, normalized_needle),
         score_text_match(title, normalized_needle),
@@ -361,16 +644,9 @@ def _compute_ranked_match(
     )
 
     filename_exact = stem_lower == normalized_needle
-    content_exact_phrase = False
-    content_partial = False
-
-    if normalized_content:
-        if normalized_content == normalized_needle:
-            content_exact_phrase = True
-        elif f" {normalized_needle} " in f" {normalized_content} ":
-            content_exact_phrase = True
-        elif score_text_match(normalized_content, normalized_needle) > 0:
-            content_partial = True
+    content_score = score_text_match(normalized_content, normalized_needle)
+    content_exact_phrase = content_score > 0 and _contains_phrase(normalized_content, normalized_needle, padded_needle)
+    content_partial = content_score > 0 and not content_exact_phrase
 
     if filename_exact:
         return {
@@ -380,17 +656,15 @@ def _compute_ranked_match(
         }
 
     if content_exact_phrase:
-        exact_phrase_base = score_text_match(normalized_content, normalized_needle)
         return {
-            "score": 2_000 + max(exact_phrase_base, 1),
+            "score": 2_000 + max(content_score, 1),
             "matchKind": "content-exact-phrase",
             "snippet": extract_search_snippet(content, normalized_needle),
         }
 
     if content_partial:
-        partial_base = score_text_match(normalized_content, normalized_needle)
         return {
-            "score": 1_000 + max(partial_base, 1),
+            "score": 1_000 + max(content_score, 1),
             "matchKind": "content-partial",
             "snippet": extract_search_snippet(content, normalized_needle),
         }
@@ -405,9 +679,9 @@ def _compute_ranked_match(
     return None
 
 
-def _compute_file_hash(file_path: Path) -> str:
-    digest = hashlib.sha256()
-    with file_path.open("rb") as handle:
+def _compute_file_hash(file_path: str) -> str:
+    digest = hashlib.new(_hash_algorithm())
+    with open(file_path, "rb") as handle:
         while True:
             chunk = handle.read(HASH_CHUNK_BYTES)
             if not chunk:
@@ -416,95 +690,325 @@ def _compute_file_hash(file_path: Path) -> str:
     return digest.hexdigest()
 
 
-def _scan_workspace_files(workspace_root: Path) -> Tuple[List[Path], List[str]]:
-    queue: List[Path] = [workspace_root]
-    visited: Set[Path] = set()
-    candidates: List[Path] = []
+def _read_file_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as handle:
+        return handle.read()
+
+
+def _read_and_hash(file_path: str) -> Tuple[bytes, str]:
+    raw_bytes = _read_file_bytes(file_path)
+    return raw_bytes, hashlib.new(_hash_algorithm(), raw_bytes).hexdigest()
+
+
+def _scan_workspace_files(workspace_root: Path) -> Tuple[List[Tuple[str, str]], List[str]]:
+    # Breadth-first so the directory cap keeps the shallowest folders. Paths
+    # stay plain strings: (absolute, workspace-relative posix) pairs are carried
+    # through the walk instead of building Path objects per entry.
+    queue: Deque[Tuple[str, str]] = deque([(str(workspace_root), "")])
+    visited: Set[str] = set()
+    candidates: List[Tuple[str, str]] = []
     diagnostics: List[str] = []
 
     while queue and len(visited) < MAX_SCAN_DIRECTORIES and len(candidates) < MAX_INDEXED_FILES:
-        directory = queue.pop(0)
+        directory, relative_dir = queue.popleft()
         if directory in visited:
             continue
 
         visited.add(directory)
 
         try:
-            entries = sorted(directory.iterdir(), key=lambda entry: entry.name.lower())
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name.lower())
         except OSError as exc:
-            relative_dir = _relative_file_path(workspace_root, directory) or "."
+            relative_dir = relative_dir or "."
             logger.warning("Skipping unreadable directory during office indexing: %s (%s)", relative_dir, exc)
             _append_diagnostic(diagnostics, f"directory-unreadable:{relative_dir}")
             continue
 
         for entry in entries:
+            relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
             if entry.is_dir():
                 if _is_included_directory(entry.name):
-                    queue.append(entry)
+                    queue.append((entry.path, relative_path))
                 continue
 
+            # is_file() follows links, so dangling symlinks, FIFOs and sockets
+            # are dropped here.
             if not entry.is_file() or entry.name.startswith(".") or entry.name.startswith("~$"):
                 continue
-            if not _is_office_candidate(entry):
+            if not _is_office_candidate(entry.name):
                 continue
 
-            candidates.append(entry)
+            candidates.append((entry.path, relative_path))
             if len(candidates) >= MAX_INDEXED_FILES:
                 break
 
     return candidates, diagnostics
 
 
+def _index_file(mode: RefreshMode, job: IndexJob) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    relative_path = job.relative_path
+    absolute_path = job.absolute_path
+    oversized = job.size_bytes > MAX_BINARY_FILE_BYTES
+    raw_bytes: Optional[bytes] = None
+    content_hash: Optional[str] = None
+
+    # The hash only detects touched-but-unchanged files, so brand-new files skip
+    # it (oversized ones are not even read). Files small enough to extract are
+    # read once and hashed from memory; larger ones are hashed in chunks.
+    if not job.previously_indexed:
+        if not oversized:
+            try:
+                raw_bytes = _read_file_bytes(absolute_path)
+            except OSError as exc:
+                logger.warning("Skipping unreadable file during extraction: %s (%s)", relative_path, exc)
+                return relative_path, "file-extract-failed", None
+    else:
+        try:
+            if oversized:
+                content_hash = _compute_file_hash(absolute_path)
+            else:
+                raw_bytes, content_hash = _read_and_hash(absolute_path)
+        except OSError as exc:
+            logger.warning("Skipping unreadable file during hash pass: %s (%s)", relative_path, exc)
+            return relative_path, "file-hash-failed", None
+
+    if mode == "incremental" and job.previously_indexed and job.previous_hash == content_hash:
+        return relative_path, "reused", None
+
+    try:
+        content, source_meta = _extract_text_for_file(Path(absolute_path), raw_bytes)
+    except OSError as exc:
+        logger.warning("Skipping unreadable file during extraction: %s (%s)", relative_path, exc)
+        return relative_path, "file-extract-failed", None
+
+    title = os.path.basename(absolute_path)
+    return relative_path, "updated", {
+        "filePath": relative_path,
+        "title": title,
+        "subtitle": relative_path,
+        "content": content,
+        "normalizedContent": _normalize_whitespace(content).lower(),
+        "stemLower": os.path.splitext(title)[0].lower(),
+        "sourceMeta": source_meta,
+        "mtimeNs": job.mtime_ns,
+        "sizeBytes": job.size_bytes,
+        "contentHash": content_hash,
+    }
+
+
+def _open_index_cache(cache_path: Path) -> sqlite3.Connection:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(cache_path))
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(INDEX_CACHE_SCHEMA)
+    return connection
+
+
+def _load_persisted_index(workspace_root: str) -> Dict[str, Dict[str, Any]]:
+    cache_path = _index_cache_path()
+    if cache_path is None or not cache_path.exists():
+        return {}
+
+    try:
+        connection = _open_index_cache(cache_path)
+        try:
+            rows = connection.execute(
+                "SELECT file_path, doc FROM office_index WHERE workspace_root = ?",
+                (workspace_root,),
+            ).fetchall()
+        finally:
+            connection.close()
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Could not load persisted office index from %s (%s)", cache_path, exc)
+        return {}
+
+    loaded: Dict[str, Dict[str, Any]] = {}
+    for file_path, raw_doc in rows:
+        try:
+            doc = _load_json_bytes(raw_doc)
+        except ValueError:
+            continue
+        content = doc.get("content") or ""
+        doc["normalizedContent"] = _normalize_whitespace(content).lower()
+        doc["stemLower"] = os.path.splitext(doc.get("title") or file_path)[0].lower()
+        loaded[file_path] = doc
+    return loaded
+
+
+def _persist_index_changes(
+    workspace_root: str,
+    updated_index: Dict[str, Dict[str, Any]],
+    changed_paths: List[str],
+    removed_paths: List[str],
+) -> None:
+    cache_path = _index_cache_path()
+    if cache_path is None or (not changed_paths and not removed_paths):
+        return
+
+    rows = [
+        (
+            workspace_root,
+            file_path,
+            _dump_json_bytes({field: updated_index[file_path].get(field) for field in PERSISTED_DOC_FIELDS}),
+        )
+        for file_path in changed_paths
+    ]
+    try:
+        connection = _open_index_cache(cache_path)
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO office_index (workspace_root, file_path, doc) VALUES (?, ?, ?)",
+                    rows,
+                )
+                connection.executemany(
+                    "DELETE FROM office_index WHERE workspace_root = ? AND file_path = ?",
+                    [(workspace_root, file_path) for file_path in removed_paths],
+                )
+        finally:
+            connection.close()
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Could not persist office index to %s (%s)", cache_path, exc)
+
+
+def _process_pool_context() -> Any:
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(start_method)
+
+
+def _get_extract_process_pool(workers: int) -> ProcessPoolExecutor:
+    global _extract_process_pool, _extract_process_pool_workers
+    with _extract_process_pool_lock:
+        if _extract_process_pool is not None and _extract_process_pool_workers != workers:
+            _extract_process_pool.shutdown(wait=False, cancel_futures=True)
+            _extract_process_pool = None
+        if _extract_process_pool is None:
+            _extract_process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=_process_pool_context())
+            _extract_process_pool_workers = workers
+        return _extract_process_pool
+
+
+def _shutdown_extract_process_pool() -> None:
+    global _extract_process_pool
+    with _extract_process_pool_lock:
+        if _extract_process_pool is not None:
+            _extract_process_pool.shutdown(wait=True, cancel_futures=True)
+            _extract_process_pool = None
+
+
+def _run_index_jobs(mode: RefreshMode, jobs: List[IndexJob]) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    pool_workers = _extract_worker_count()
+    workers = min(len(jobs), pool_workers)
+    modes = [mode] * len(jobs)
+
+    # Local OOXML parsing is CPU-bound and holds the GIL, so larger batches go
+    # to worker processes; OpenSearch extraction is network-bound and stays on
+    # threads, which also share the keep-alive connection pool.
+    if workers > 1 and len(jobs) >= PROCESS_POOL_MIN_FILES and _opensearch_config() is None:
+        try:
+            executor = _get_extract_process_pool(pool_workers)
+            chunk_size = max(1, len(jobs) // (workers * 4))
+            return list(executor.map(_index_file, modes, jobs, chunksize=chunk_size))
+        except (OSError, BrokenProcessPool) as exc:
+            logger.warning("OfficeIndex process pool unavailable; extracting on threads (%s)", exc)
+            _shutdown_extract_process_pool()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="officeindex-extract") as executor:
+        return list(executor.map(_index_file, modes, jobs))
+
+
+def _build_token_index(index: Dict[str, Dict[str, Any]]) -> TokenIndex:
+    postings: Dict[str, List[str]] = {}
+    for file_path, doc in index.items():
+        for token in set((doc.get("normalizedContent") or "").split()):
+            postings.setdefault(token, []).append(file_path)
+    return TokenIndex(
+        postings={token: tuple(paths) for token, paths in postings.items()},
+        sorted_tokens=sorted(postings),
+        sorted_reversed_tokens=sorted(token[::-1] for token in postings),
+    )
+
+
+def _sorted_prefix_matches(sorted_tokens: List[str], prefix: str) -> List[str]:
+    matches: List[str] = []
+    position = bisect_left(sorted_tokens, prefix)
+    while position < len(sorted_tokens) and sorted_tokens[position].startswith(prefix):
+        matches.append(sorted_tokens[position])
+        position += 1
+    return matches
+
+
+def _content_candidates(token_index: TokenIndex, normalized_needle: str) -> Optional[Set[str]]:
+    # A substring hit for "t1 ... tk" needs a token ending with t1, whole tokens
+    # for the middle terms and a token starting with tk; a single term may sit
+    # anywhere inside a token. None means every document has to be checked.
+    terms = normalized_needle.split()
+    if not terms:
+        return set()
+
+    postings = token_index.postings
+    if len(terms) == 1:
+        if len(postings) > MAX_INFIX_SCAN_TOKENS:
+            return None
+        term = terms[0]
+        return {path for token, paths in postings.items() if term in token for path in paths}
+
+    first, last = terms[0], terms[-1]
+    candidates = {
+        path
+        for reversed_token in _sorted_prefix_matches(token_index.sorted_reversed_tokens, first[::-1])
+        for path in postings[reversed_token[::-1]]
+    }
+    for term in terms[1:-1]:
+        if not candidates:
+            return candidates
+        candidates.intersection_update(postings.get(term, ()))
+    if candidates:
+        candidates.intersection_update(
+            path for token in _sorted_prefix_matches(token_index.sorted_tokens, last) for path in postings[token]
+        )
+    return candidates
+
+
 def _finalize_refresh_state(
     mode: RefreshMode,
     updated_index: Dict[str, Dict[str, Any]],
     summary: Dict[str, Any],
+    failed_files: Dict[str, Tuple[str, Optional[Tuple[int, int]]]],
     error: Optional[str] = None,
+    token_index: Optional[TokenIndex] = None,
 ) -> None:
     global _last_indexed_at
     global _last_refresh_mode
     global _last_refresh_summary
     global _last_refresh_error
+    global _last_refresh_monotonic
+    global _index_by_path
+    global _token_index
+    global _failed_files
 
     with _index_lock:
-        _index_by_path.clear()
-        _index_by_path.update(updated_index)
+        _index_by_path = updated_index
+        _failed_files = failed_files
+        if token_index is not None:
+            _token_index = token_index
         _last_indexed_at = time.time()
+        _last_refresh_monotonic = time.monotonic()
         _last_refresh_mode = mode
         _last_refresh_summary = dict(summary)
         _last_refresh_error = error
 
 
-def _refresh_index(mode: RefreshMode, bypass_interval: bool) -> Dict[str, Any]:
+def _refresh_index(mode: RefreshMode) -> Dict[str, Any]:
     with _refresh_lock:
         started_at = time.perf_counter()
-        now = time.time()
+        _clear_config_cache()
         diagnostics: List[str] = []
 
         with _index_lock:
-            current_size = len(_index_by_path)
-            previous = dict(_index_by_path)
-            should_skip = (
-                mode == "incremental"
-                and not bypass_interval
-                and _last_indexed_at > 0
-                and (now - _last_indexed_at) < _refresh_interval_seconds()
-            )
-
-        if should_skip:
-            return {
-                "status": "skipped",
-                "mode": mode,
-                "reason": "refresh-interval",
-                "indexedFiles": current_size,
-                "scannedFiles": 0,
-                "reusedFiles": 0,
-                "updatedFiles": 0,
-                "removedFiles": 0,
-                "failedFiles": 0,
-                "diagnostics": [],
-                "tookMs": int((time.perf_counter() - started_at) * 1000),
-            }
+            previous = _index_by_path
 
         workspace_root = resolve_workspace_root()
         if not workspace_root.exists() or not workspace_root.is_dir():
@@ -515,25 +1019,33 @@ def _refresh_index(mode: RefreshMode, bypass_interval: bool) -> Dict[str, Any]:
                 _last_refresh_error = message
             raise FileNotFoundError(message)
 
+        # After a restart the in-memory index is empty; seed it from the
+        # persisted cache so unchanged files are reused instead of re-extracted.
+        global _index_cache_loaded_root
+        root_key = str(workspace_root)
+        loaded_from_cache = False
+        if not previous and _index_cache_loaded_root != root_key:
+            previous = _load_persisted_index(root_key)
+            loaded_from_cache = bool(previous)
+        _index_cache_loaded_root = root_key
+
         scanned_paths, scan_diagnostics = _scan_workspace_files(workspace_root)
         for warning in scan_diagnostics:
             _append_diagnostic(diagnostics, warning)
 
         updated: Dict[str, Dict[str, Any]] = {}
+        changed_paths: List[str] = []
+        failures: Dict[str, Tuple[str, Optional[Tuple[int, int]]]] = {}
         reused_files = 0
         updated_files = 0
-        failed_files = 0
-
-        for absolute_path in scanned_paths:
-            relative_path = _relative_file_path(workspace_root, absolute_path)
-            if not relative_path:
-                continue
 
+        pending: List[IndexJob] = []
+        for absolute_path, relative_path in scanned_paths:
             try:
-                stats = absolute_path.stat()
+                stats = os.stat(absolute_path)
             except OSError as exc:
                 logger.warning("Skipping file with unreadable stat: %s (%s)", relative_path, exc)
-                failed_files += 1
+                failures[relative_path] = (absolute_path, None)
                 _append_diagnostic(diagnostics, f"file-stat-failed:{relative_path}")
                 continue
 
@@ -548,45 +1060,33 @@ def _refresh_index(mode: RefreshMode, bypass_interval: bool) -> Dict[str, Any]:
                 reused_files += 1
                 continue
 
-            try:
-                content_hash = _compute_file_hash(absolute_path)
-            except OSError as exc:
-                logger.warning("Skipping unreadable file during hash pass: %s (%s)", relative_path, exc)
-                failed_files += 1
-                _append_diagnostic(diagnostics, f"file-hash-failed:{relative_path}")
-                continue
-
-            if (
-                mode == "incremental"
-                and existing
-                and existing.get("contentHash") == content_hash
-            ):
-                reused = dict(existing)
-                reused["mtimeNs"] = stats.st_mtime_ns
-                reused["sizeBytes"] = stats.st_size
-                updated[relative_path] = reused
-                reused_files += 1
-                continue
+            pending.append(
+                IndexJob(
+                    relative_path=relative_path,
+                    absolute_path=absolute_path,
+                    size_bytes=stats.st_size,
+                    mtime_ns=stats.st_mtime_ns,
+                    previously_indexed=existing is not None,
+                    previous_hash=existing.get("contentHash") if existing is not None else None,
+                )
+            )
 
-            try:
-                content, source_meta = _extract_text_for_file(absolute_path)
-            except OSError as exc:
-                logger.warning("Skipping unreadable file during extraction: %s (%s)", relative_path, exc)
-                failed_files += 1
-                _append_diagnostic(diagnostics, f"file-extract-failed:{relative_path}")
-                continue
-
-            updated[relative_path] = {
-                "filePath": relative_path,
-                "title": absolute_path.name,
-                "subtitle": relative_path,
-                "content": content,
-                "sourceMeta": source_meta,
-                "mtimeNs": stats.st_mtime_ns,
-                "sizeBytes": stats.st_size,
-                "contentHash": content_hash,
-            }
-            updated_files += 1
+        if pending:
+            for job, (relative_path, outcome, entry) in zip(pending, _run_index_jobs(mode, pending)):
+                if outcome == "reused":
+                    reused = dict(previous[relative_path])
+                    reused["mtimeNs"] = job.mtime_ns
+                    reused["sizeBytes"] = job.size_bytes
+                    updated[relative_path] = reused
+                    changed_paths.append(relative_path)
+                    reused_files += 1
+                elif outcome == "updated":
+                    updated[relative_path] = entry
+                    changed_paths.append(relative_path)
+                    updated_files += 1
+                else:
+                    failures[relative_path] = (job.absolute_path, (job.mtime_ns, job.size_bytes))
+                    _append_diagnostic(diagnostics, f"{outcome}:{relative_path}")
 
         removed_files = max(0, len(previous) - len(updated))
         summary = {
@@ -597,21 +1097,37 @@ def _refresh_index(mode: RefreshMode, bypass_interval: bool) -> Dict[str, Any]:
             "reusedFiles": reused_files,
             "updatedFiles": updated_files,
             "removedFiles": removed_files,
-            "failedFiles": failed_files,
+            "failedFiles": len(failures),
             "diagnostics": diagnostics,
             "tookMs": int((time.perf_counter() - started_at) * 1000),
         }
-        _finalize_refresh_state(mode=mode, updated_index=updated, summary=summary, error=None)
+        # Postings only depend on path + content, so unchanged refreshes keep them.
+        index_changed = bool(updated_files or removed_files or loaded_from_cache)
+        token_index = _build_token_index(updated) if index_changed else None
+        _finalize_refresh_state(
+            mode=mode,
+            updated_index=updated,
+            summary=summary,
+            failed_files=failures,
+            error=None,
+            token_index=token_index,
+        )
+        removed_paths = [file_path for file_path in previous if file_path not in updated]
+        _persist_index_changes(root_key, updated, changed_paths, removed_paths)
         return summary
 
 
 def _search_index(query: str, limit: int) -> List[Dict[str, Any]]:
-    needle_lower = query.lower()
+    normalized_needle = _normalize_whitespace(query.lower())
+    padded_needle = f" {normalized_needle} "
     with _index_lock:
-        docs = list(_index_by_path.values())
+        index = _index_by_path
+        token_index = _token_index
+
+    candidates = _content_candidates(token_index, normalized_needle)
 
     results: List[Dict[str, Any]] = []
-    for doc in docs:
+    for doc in index.values():
         file_path = doc.get("filePath") or ""
         title = doc.get("title") or file_path
         content = doc.get("content") or ""
@@ -620,7 +1136,12 @@ def _search_index(query: str, limit: int) -> List[Dict[str, Any]]:
             file_path=file_path,
             title=title,
             content=content,
-            needle_lower=needle_lower,
+            normalized_content=(
+                (doc.get("normalizedContent") or "") if candidates is None or file_path in candidates else ""
+            ),
+            stem_lower=doc.get("stemLower") or Path(title).stem.lower(),
+            normalized_needle=normalized_needle,
+            padded_needle=padded_needle,
         )
         if not ranked:
             continue
@@ -642,10 +1163,63 @@ def _search_index(query: str, limit: int) -> List[Dict[str, Any]]:
     return _sort_results(results)[:limit]
 
 
+def _run_search_refresh() -> None:
+    global _last_refresh_error
+    try:
+        _refresh_index(mode="incremental")
+    except FileNotFoundError as exc:
+        logger.warning("OfficeIndex refresh skipped due to missing workspace root: %s", exc)
+    except Exception:
+        logger.exception("OfficeIndex refresh failed; serving stale/partial index.")
+        with _index_lock:
+            _last_refresh_error = "unexpected-error"
+
+
+def _prune_resolved_failures() -> None:
+    # Failed files that were deleted or changed since the last refresh no
+    # longer degrade searches; the refresh being scheduled re-checks the rest.
+    global _failed_files
+    with _index_lock:
+        failures = _failed_files
+    if not failures:
+        return
+
+    remaining: Dict[str, Tuple[str, Optional[Tuple[int, int]]]] = {}
+    for relative_path, (absolute_path, signature) in failures.items():
+        try:
+            stats = os.stat(absolute_path)
+        except FileNotFoundError:
+            continue
+        except OSError:
+            remaining[relative_path] = (absolute_path, signature)
+            continue
+        if signature == (stats.st_mtime_ns, stats.st_size):
+            remaining[relative_path] = (absolute_path, signature)
+
+    with _index_lock:
+        if _failed_files is failures:
+            _failed_files = remaining
+
+
+def _maybe_schedule_refresh() -> None:
+    global _search_refresh_future
+    if time.monotonic() - _last_refresh_monotonic < _refresh_interval_seconds():
+        return
+
+    _prune_resolved_failures()
+    with _search_refresh_lock:
+        if _search_refresh_future is not None and not _search_refresh_future.done():
+            return
+        try:
+            _search_refresh_future = _search_refresh_executor.submit(_run_search_refresh)
+        except RuntimeError:
+            logger.warning("OfficeIndex refresh executor is shut down; serving current index.")
+
+
 def _background_loop(interval_seconds: int) -> None:
     while not _background_stop.wait(interval_seconds):
         try:
-            summary = _refresh_index(mode="incremental", bypass_interval=True)
+            summary = _refresh_index(mode="incremental")
             if summary.get("status") == "ok":
                 logger.info(
                     "OfficeIndex background refresh complete (indexed=%s, updated=%s, failed=%s).",
@@ -659,6 +1233,7 @@ def _background_loop(interval_seconds: int) -> None:
 
 @app.on_event("startup")
 def _start_background_sync() -> None:
+    _clear_config_cache()
     interval_seconds = _background_sync_seconds()
     if interval_seconds <= 0:
         return
@@ -681,6 +1256,9 @@ def _start_background_sync() -> None:
 @app.on_event("shutdown")
 def _stop_background_sync() -> None:
     _background_stop.set()
+    _search_refresh_executor.shutdown(wait=False)
+    _shutdown_extract_process_pool()
+    _close_opensearch_pool()
 
 
 @app.get("/health")
@@ -722,21 +1300,28 @@ def search(payload: OfficeSearchRequest) -> Dict[str, Any]:
     degraded = False
     diagnostics: List[str] = []
 
-    try:
-        summary = _refresh_index(mode="incremental", bypass_interval=False)
-        failed_count = int(summary.get("failedFiles", 0) or 0)
-        if failed_count > 0:
-            degraded = True
-            for warning in summary.get("diagnostics", []):
-                _append_diagnostic(diagnostics, warning)
-    except FileNotFoundError as exc:
+    # Only the very first search builds the index inline; afterwards results
+    # may lag by up to one refresh interval while a background refresh runs.
+    if _last_indexed_at <= 0:
+        _run_search_refresh()
+    else:
+        _maybe_schedule_refresh()
+
+    with _index_lock:
+        last_error = _last_refresh_error
+        last_summary = _last_refresh_summary
+        failed_files = _failed_files
+
+    if last_error:
         degraded = True
-        logger.warning("OfficeIndex refresh skipped due to missing workspace root: %s", exc)
-        _append_diagnostic(diagnostics, f"refresh-failed:{exc}")
-    except Exception:
+        _append_diagnostic(diagnostics, f"refresh-failed:{last_error}")
+    if failed_files:
         degraded = True
-        logger.exception("OfficeIndex refresh failed; serving stale/partial index.")
-        _append_diagnostic(diagnostics, "refresh-failed:unexpected-error")
+        for warning in last_summary.get("diagnostics", []):
+            outcome, _, relative_path = warning.partition(":")
+            if outcome in FILE_FAILURE_OUTCOMES and relative_path not in failed_files:
+                continue
+            _append_diagnostic(diagnostics, warning)
 
     results = _search_index(query, limit)
 
@@ -765,7 +1350,7 @@ def reindex(payload: Optional[OfficeReindexRequest] = None) -> Dict[str, Any]:
         ) from exc
 
     try:
-        summary = _refresh_index(mode=mode, bypass_interval=True)
+        summary = _refresh_index(mode=mode)
     except FileNotFoundError as exc:
         raise HTTPException(
             status_code=503,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import io
 import json
 import os
 import sys
@@ -8,6 +9,8 @@ from typing import Any, Dict
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from .common import decode_content
+
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Trigger OfficeIndex full or incremental reindex.")
@@ -35,14 +38,25 @@ def _post_json(url: str, payload: Dict[str, Any], timeout_seconds: int) -> Dict[
     request = Request(
         url,
         data=json.dumps(payload).encode("utf-8"),
-        headers={"content-type": "application/json"},
+        headers={"content-type": "application/json", "accept-encoding": "gzip, deflate"},
         method="POST",
     )
 
-    with urlopen(request, timeout=max(1, timeout_seconds)) as response:
-        body = response.read().decode("utf-8")
+    # POST /reindex is not idempotent, so a failed request is never resent.
+    try:
+        with urlopen(request, timeout=max(1, timeout_seconds)) as response:
+            raw = response.read()
+            content_encoding = response.headers.get("content-encoding")
+    except HTTPError as exc:
+        error_body = exc.read()
+        try:
+            error_body = decode_content(error_body, exc.headers.get("content-encoding"))
+        except ValueError:
+            pass
+        raise HTTPError(url, exc.code, exc.reason, exc.headers, io.BytesIO(error_body)) from exc
 
-    parsed = json.loads(body)
+    raw = decode_content(raw, content_encoding)
+    parsed = json.loads(raw.decode("utf-8"))
     if not isinstance(parsed, dict):
         raise ValueError("Expected JSON object in response.")
 
@@ -59,7 +73,7 @@ def main() -> int:
         raw = exc.read().decode("utf-8", errors="replace")
         print(raw or f"HTTP {exc.code}", file=sys.stderr)
         return 1
-    except URLError as exc:
+    except (URLError, OSError) as exc:
         print(f"Request failed: {exc}", file=sys.stderr)
         return 1
     except (json.JSONDecodeError, ValueError) as exc:
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import heapq
 import os
+import stat
 import time
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from threading import Lock
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -13,7 +18,7 @@ from .common import (
     parse_limit,
     parse_query,
     resolve_workspace_root,
-    score_text_match,
+    score_lowered_text_match,
 )
 
 app = FastAPI(title="OpenWork PageIndex Adapter", version="0.1.0")
@@ -22,33 +27,42 @@ MAX_FILE_SCAN_DIRECTORIES = 300
 MAX_FILE_SCAN_RESULTS = 240
 MAX_FILE_CONTENT_READS = 80
 MAX_FILE_CONTENT_BYTES = 280_000
+SCAN_WORKERS = 8
+DEFAULT_REFRESH_INTERVAL_SECONDS = 30
+SNIPPET_RADIUS = 90
+WORKSPACE_ROOT_RECHECK_SECONDS = 5.0
+
+EXCLUDED_DIRECTORY_NAMES = frozenset(
+    {
+        ".git",
+        ".next",
+        "node_modules",
+        "dist",
+        "build",
+        "coverage",
+        ".turbo",
+        ".cache",
+    }
+)
 
-EXCLUDED_DIRECTORY_NAMES = {
-    ".git",
-    ".next",
-    "node_modules",
-    "dist",
-    "build",
-    "coverage",
-    ".turbo",
-    ".cache",
-}
-
-EDITABLE_TEXT_EXTENSIONS = {
-    ".txt",
-    ".md",
-    ".csv",
-    ".rtf",
-    ".json",
-    ".yaml",
-    ".yml",
-    ".ts",
-    ".tsx",
-    ".js",
-    ".jsx",
-    ".html",
-    ".css",
-}
+# Lowercased extensions without the leading dot, matched against name.rpartition(".").
+EDITABLE_TEXT_SUFFIXES = frozenset(
+    {
+        "txt",
+        "md",
+        "csv",
+        "rtf",
+        "json",
+        "yaml",
+        "yml",
+        "ts",
+        "tsx",
+        "js",
+        "jsx",
+        "html",
+        "css",
+    }
+)
 
 
 class PageSearchRequest(BaseModel):
@@ -56,23 +70,303 @@ class PageSearchRequest(BaseModel):
     limit: Optional[int] = None
 
 
+class _IndexedFile(NamedTuple):
+    path: str
+    name: str
+    relative_path: str
+    relative_lower: str
+    editable: bool
+
+
+class _ResultRow(NamedTuple):
+    # Field order is the ranking order; file paths are unique, so comparisons
+    # never reach the title or snippet.
+    score: int
+    file_path: str
+    title: str
+    snippet: Optional[str]
+
+
+class _PageIndex(NamedTuple):
+    root: str
+    files: Tuple[_IndexedFile, ...]
+    built_at: float
+
+
+# scandir, stat and read release the GIL, so directory listings and content
+# reads overlap on this shared pool.
+_scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="pageindex-scan")
+
+# (root, monotonic time) of the last successful directory check; only positive
+# results are cached so a missing root is reported immediately.
+_verified_workspace_root: Optional[Tuple[str, float]] = None
+
+# The capped BFS listing of the workspace, rebuilt once it is older than the
+# refresh interval. It is rebound, never mutated, so searches read it lock-free.
+_page_index: Optional[_PageIndex] = None
+_refresh_lock = Lock()
+
+
+def _refresh_interval_seconds() -> int:
+    raw = (os.getenv("PAGEINDEX_REFRESH_INTERVAL_SECONDS") or "").strip()
+    if not raw:
+        return DEFAULT_REFRESH_INTERVAL_SECONDS
+
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_REFRESH_INTERVAL_SECONDS
+
+
 def _is_included_directory(name: str) -> bool:
-    normalized = name.lower()
-    if normalized.startswith("."):
-        return False
-    return normalized not in EXCLUDED_DIRECTORY_NAMES
+    # Dot-directories are rejected before paying for the lowercase copy.
+    return name[:1] != "." and name.lower() not in EXCLUDED_DIRECTORY_NAMES
+
+
+def _ascii_needle_bytes(needle_lower: str) -> Optional[bytes]:
+    if not needle_lower.isascii() or "\r" in needle_lower or "\n" in needle_lower:
+        return None
+    return needle_lower.encode("ascii")
+
+
+def _decode_text(raw: bytes, encoding: str = "utf-8") -> str:
+    # Mirrors Path.read_text(encoding="utf-8"), including universal newlines.
+    return raw.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _window_snippet(content: str, index: int, needle_length: int) -> str:
+    # Same output as extract_search_snippet for ASCII text and a needle without
+    # whitespace, whose first hit is the same before and after whitespace is
+    # collapsed; only the text around that hit is normalized.
+    width = SNIPPET_RADIUS * 2
+    while True:
+        window_start = max(0, index - width)
+        left = " ".join(content[window_start:index].split())
+        if left and content[index - 1].isspace():
+            left += " "
+        if window_start == 0 or len(left) > SNIPPET_RADIUS:
+            break
+        width *= 2
+
+    keep = needle_length + SNIPPET_RADIUS
+    width = keep * 2
+    while True:
+        window_end = index + width
+        right = " ".join(content[index:window_end].split())
+        if window_end >= len(content) or len(right) > keep:
+            break
+        width *= 2
+
+    prefix = "…" if len(left) > SNIPPET_RADIUS else ""
+    suffix = "…" if len(right) > keep else ""
+    return f"{prefix}{(left[-SNIPPET_RADIUS:] + right[:keep]).strip()}{suffix}"
+
+
+def _top_results(rows: List[_ResultRow], limit: int) -> List[Dict[str, Any]]:
+    # Same order as sorted(..., reverse=True)[:limit] in O(n log limit); only
+    # the returned rows are turned into response dicts.
+    return [
+        {
+            "id": row.file_path,
+            "filePath": row.file_path,
+            "title": row.title,
+            "subtitle": row.file_path,
+            "snippet": row.snippet,
+            "score": row.score,
+        }
+        for row in heapq.nlargest(limit, rows)
+    ]
+
+
+def _workspace_root_is_directory(root_value: str) -> bool:
+    global _verified_workspace_root
+    now = time.monotonic()
+    verified = _verified_workspace_root
+    if verified is not None and verified[0] == root_value and now - verified[1] < WORKSPACE_ROOT_RECHECK_SECONDS:
+        return True
+
+    try:
+        is_directory = stat.S_ISDIR(os.stat(root_value).st_mode)
+    except OSError:
+        is_directory = False
+
+    _verified_workspace_root = (root_value, now) if is_directory else None
+    return is_directory
+
+
+def _relative_file_path(root_prefix: str, file_path: str) -> str:
+    relative_path = file_path[len(root_prefix):]
+    return relative_path if os.sep == "/" else relative_path.replace(os.sep, "/")
+
+
+def _scan_directory(directory: str, root_prefix: str) -> Optional[Tuple[List[str], List[_IndexedFile]]]:
+    try:
+        with os.scandir(directory) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return None
+
+    child_directories: List[str] = []
+    files: List[_IndexedFile] = []
+    for entry in entries:
+        try:
+            is_directory = entry.is_dir()
+            is_file = not is_directory and entry.is_file()
+        except OSError:
+            continue
 
+        if is_directory:
+            if _is_included_directory(entry.name):
+                child_directories.append(entry.path)
+            continue
 
-def _is_editable_text_document(path_value: Path) -> bool:
-    return path_value.suffix.lower() in EDITABLE_TEXT_EXTENSIONS
+        if not is_file or entry.name.startswith(".") or entry.name.startswith("~$"):
+            continue
+
+        relative_path = _relative_file_path(root_prefix, entry.path)
+        stem, _, suffix = entry.name.rpartition(".")
+        files.append(
+            _IndexedFile(
+                path=entry.path,
+                name=entry.name,
+                relative_path=relative_path,
+                relative_lower=relative_path.lower(),
+                editable=bool(stem) and suffix.lower() in EDITABLE_TEXT_SUFFIXES,
+            )
+        )
 
+    return child_directories, files
+
+
+def _build_page_index(root_value: str) -> _PageIndex:
+    root_prefix = os.path.join(root_value, "")
+    queue: Deque[str] = deque([root_value])
+    directories_scanned = 0
+    files: List[_IndexedFile] = []
+
+    # Each pass lists one BFS level on the scan pool and merges the listings
+    # back in BFS order, so the directory cap keeps the same directories.
+    # Queued paths are unique parent/name strings, even through symlink loops,
+    # so the cap alone bounds the walk and no visited set is needed.
+    while queue and directories_scanned < MAX_FILE_SCAN_DIRECTORIES:
+        level_size = min(len(queue), MAX_FILE_SCAN_DIRECTORIES - directories_scanned)
+        level = [queue.popleft() for _ in range(level_size)]
+        directories_scanned += level_size
+
+        for listing in _scan_executor.map(_scan_directory, level, repeat(root_prefix)):
+            if listing is None:
+                continue
+            child_directories, level_files = listing
+            queue.extend(child_directories)
+            files.extend(level_files)
+
+    return _PageIndex(root=root_value, files=tuple(files), built_at=time.monotonic())
+
+
+def _is_fresh(index: Optional[_PageIndex], root_value: str) -> bool:
+    return (
+        index is not None
+        and index.root == root_value
+        and time.monotonic() - index.built_at < _refresh_interval_seconds()
+    )
+
+
+def _current_page_index(root_value: str) -> _PageIndex:
+    global _page_index
+    index = _page_index
+    if _is_fresh(index, root_value):
+        return index
+
+    with _refresh_lock:
+        index = _page_index
+        if _is_fresh(index, root_value):
+            return index
+        index = _build_page_index(root_value)
+        _page_index = index
+        return index
+
+
+def _path_score(relative_lower: str, needle_lower: str) -> int:
+    path_score = score_lowered_text_match(relative_lower, needle_lower)
+    if path_score:
+        # The name is a suffix of the path, so it can only match when the
+        # path does; lowercasing never crosses the "/" separator.
+        name_lower = relative_lower[relative_lower.rfind("/") + 1 :]
+        path_score = max(path_score, score_lowered_text_match(name_lower, needle_lower))
+    return path_score
+
+
+def _score_file_content(
+    file_path: str,
+    needle_lower: str,
+    needle_bytes: Optional[bytes],
+    needle_is_token: bool,
+) -> Optional[Tuple[int, Optional[str]]]:
+    # None means the file was not read (too large or unreadable) and does not
+    # count against MAX_FILE_CONTENT_READS.
+    try:
+        with open(file_path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size > MAX_FILE_CONTENT_BYTES:
+                return None
+            raw = handle.read()
+        # bytes.lower() only agrees with str.lower() on ASCII, so the memmem
+        # reject and the byte-level lowering are limited to pure-ASCII files.
+        if raw.isascii() and needle_bytes is not None:
+            raw_lower = raw.lower()
+            if needle_bytes not in raw_lower:
+                return 0, None
+            content = _decode_text(raw, "latin-1")
+            content_lower = _decode_text(raw_lower, "latin-1")
+            if needle_is_token:
+                content_score = score_lowered_text_match(content_lower, needle_lower)
+                index = content_lower.find(needle_lower)
+                return content_score, _window_snippet(content, index, len(needle_lower))
+        else:
+            content = _decode_text(raw)
+            content_lower = content.lower()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    content_score = score_lowered_text_match(content_lower, needle_lower)
+    snippet = extract_search_snippet(content, needle_lower, SNIPPET_RADIUS) if content_score > 0 else None
+    return content_score, snippet
+
+
+def _score_content_candidates(
+    files: Tuple[_IndexedFile, ...],
+    candidates: List[int],
+    needle_lower: str,
+    needle_bytes: Optional[bytes],
+) -> Dict[int, Tuple[int, Optional[str]]]:
+    needle_is_token = not any(character.isspace() for character in needle_lower)
+    # Reads go out in order in batches no larger than the remaining budget, so
+    # the same files are read as in a sequential scan even when some fail.
+    outcomes: Dict[int, Tuple[int, Optional[str]]] = {}
+    reads = 0
+    cursor = 0
+
+    while cursor < len(candidates) and reads < MAX_FILE_CONTENT_READS:
+        batch = candidates[cursor : cursor + MAX_FILE_CONTENT_READS - reads]
+        cursor += len(batch)
+        batch_outcomes = _scan_executor.map(
+            _score_file_content,
+            [files[index].path for index in batch],
+            repeat(needle_lower),
+            repeat(needle_bytes),
+            repeat(needle_is_token),
+        )
+        for index, outcome in zip(batch, batch_outcomes):
+            if outcome is None:
+                continue
+            reads += 1
+            outcomes[index] = outcome
 
-def _sort_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return sorted(results, key=lambda item: (item["score"], item["filePath"]), reverse=True)
+    return outcomes
 
 
-def _relative_file_path(root: Path, file_path: Path) -> str:
-    return file_path.relative_to(root).as_posix()
+@app.on_event("shutdown")
+def _shutdown_scan_executor() -> None:
+    _scan_executor.shutdown(wait=False)
 
 
 @app.get("/health")
@@ -94,9 +388,11 @@ def search(payload: PageSearchRequest) -> Dict[str, Any]:
 
     limit = parse_limit(payload.limit)
     needle_lower = query.lower()
+    needle_bytes = _ascii_needle_bytes(needle_lower)
 
     workspace_root = resolve_workspace_root()
-    if not workspace_root.exists() or not workspace_root.is_dir():
+    workspace_root_value = os.fspath(workspace_root)
+    if not _workspace_root_is_directory(workspace_root_value):
         raise HTTPException(
             status_code=503,
             detail={
@@ -105,79 +401,36 @@ def search(payload: PageSearchRequest) -> Dict[str, Any]:
             },
         )
 
-    queue: List[Path] = [workspace_root]
-    visited: Set[Path] = set()
-    results: List[Dict[str, Any]] = []
-    content_reads = 0
-
-    while queue and len(visited) < MAX_FILE_SCAN_DIRECTORIES:
-        directory = queue.pop(0)
-        if directory in visited:
-            continue
-
-        visited.add(directory)
-
-        try:
-            entries = list(directory.iterdir())
-        except OSError:
+    index = _current_page_index(workspace_root_value)
+    files = index.files
+    path_scores = [_path_score(indexed.relative_lower, needle_lower) for indexed in files]
+    content_outcomes = _score_content_candidates(
+        files,
+        [position for position, indexed in enumerate(files) if path_scores[position] == 0 and indexed.editable],
+        needle_lower,
+        needle_bytes,
+    )
+
+    rows: List[_ResultRow] = []
+    for position, indexed in enumerate(files):
+        path_score = path_scores[position]
+        content_score, snippet = content_outcomes.get(position, (0, None))
+        if path_score == 0 and content_score == 0:
             continue
 
-        for entry in entries:
-            if entry.is_dir():
-                if _is_included_directory(entry.name):
-                    queue.append(entry)
-                continue
-
-            if not entry.is_file() or entry.name.startswith(".") or entry.name.startswith("~$"):
-                continue
-
-            relative_path = _relative_file_path(workspace_root, entry)
-            path_score = max(
-                score_text_match(relative_path, needle_lower),
-                score_text_match(entry.name, needle_lower),
-            )
-
-            content_score = 0
-            snippet = None
-
-            if path_score == 0 and _is_editable_text_document(entry) and content_reads < MAX_FILE_CONTENT_READS:
-                try:
-                    file_size = entry.stat().st_size
-                    if file_size <= MAX_FILE_CONTENT_BYTES:
-                        content = entry.read_text(encoding="utf-8")
-                        content_reads += 1
-                        content_score = score_text_match(content, needle_lower)
-                        if content_score > 0:
-                            snippet = extract_search_snippet(content, needle_lower)
-                except (OSError, UnicodeDecodeError):
-                    pass
-
-            if path_score == 0 and content_score == 0:
-                continue
-
-            results.append(
-                {
-                    "id": relative_path,
-                    "filePath": relative_path,
-                    "title": entry.name,
-                    "subtitle": relative_path,
-                    "snippet": snippet,
-                    "score": max(path_score + 40, content_score + 16),
-                }
-            )
-
-            if len(results) >= MAX_FILE_SCAN_RESULTS:
-                break
+        # Content is only read when the path missed, so one side is always zero.
+        score = path_score + 40 if path_score else content_score + 16
+        rows.append(_ResultRow(score, indexed.relative_path, indexed.name, snippet))
 
-        if len(results) >= MAX_FILE_SCAN_RESULTS:
+        if len(rows) >= MAX_FILE_SCAN_RESULTS:
             break
 
-    merged = _sort_results(results)[:limit]
+    merged = _top_results(rows, limit)
 
     return {
         "query": query,
         "total": len(merged),
         "tookMs": int((time.perf_counter() - started_at) * 1000),
-        "workspaceRoot": os.fspath(workspace_root),
+        "workspaceRoot": workspace_root_value,
         "results": merged,
     }
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from agent_runtime.search_adapters import chatindex_api as chatindex
+from agent_runtime.search_adapters.common import extract_search_snippet
+
+
+ENV_KEYS = ["DATABASE_URL", "CHATINDEX_FTS_PATH"]
+
+SCHEMA_SQL = """
+CREATE TABLE "User" (
+  "id" TEXT NOT NULL PRIMARY KEY,
+  "displayName" TEXT NOT NULL,
+  "avatarColor" TEXT NOT NULL,
+  "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE "Channel" (
+  "id" TEXT NOT NULL PRIMARY KEY,
+  "slug" TEXT NOT NULL,
+  "name" TEXT NOT NULL,
+  "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE "Conversation" (
+  "id" TEXT NOT NULL PRIMARY KEY,
+  "type" TEXT NOT NULL,
+  "channelId" TEXT,
+  "dmUserAId" TEXT,
+  "dmUserBId" TEXT,
+  "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE "Message" (
+  "id" TEXT NOT NULL PRIMARY KEY,
+  "conversationId" TEXT NOT NULL,
+  "senderId" TEXT NOT NULL,
+  "body" TEXT NOT NULL,
+  "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _reset_chatindex_state() -> None:
+    chatindex._close_connection_pool()
+    chatindex._bootstrapped = False
+    chatindex._fts_ready = None
+
+
+def _search_request() -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/search", "headers": [], "query_string": b""})
+
+
+class ChatIndexAdapterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="openwork-chatindex-tests-"))
+        self.previous_env = {key: os.environ.get(key) for key in ENV_KEYS}
+        self.database_path = self.temp_dir / "chat.db"
+
+        os.environ["DATABASE_URL"] = f"file:{self.database_path}"
+        os.environ["CHATINDEX_FTS_PATH"] = str(self.temp_dir / "chat-fts.sqlite3")
+
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            connection.executescript(SCHEMA_SQL)
+            connection.executemany(
+                'INSERT INTO "User" ("id", "displayName", "avatarColor") VALUES (?, ?, ?)',
+                [
+                    ("u_alex", "Alex Rivera", "#111111"),
+                    ("u_blair", "Blair Chen", "#222222"),
+                    ("u_casey", "Casey Morgan", "#333333"),
+                ],
+            )
+            connection.execute(
+                'INSERT INTO "Channel" ("id", "slug", "name") VALUES (?, ?, ?)',
+                ("ch_release", "release-train", "Release Train"),
+            )
+            connection.executemany(
+                'INSERT INTO "Conversation" ("id", "type", "channelId", "dmUserAId", "dmUserBId", "createdAt") '
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    ("conv_release", "CHANNEL", "ch_release", None, None, "2026-01-01T09:00:00.000Z"),
+                    ("conv_dm_alex_blair", "DM", None, "u_alex", "u_blair", "2026-01-02T09:00:00.000Z"),
+                    ("conv_dm_blair_casey", "DM", None, "u_blair", "u_casey", "2026-01-03T09:00:00.000Z"),
+                ],
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+        _reset_chatindex_state()
+
+    def tearDown(self) -> None:
+        _reset_chatindex_state()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+        for key, value in self.previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def _insert_messages(self, rows: List[Tuple[str, str, str, str, str]]) -> None:
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            connection.executemany(
+                'INSERT INTO "Message" ("id", "conversationId", "senderId", "body", "createdAt") VALUES (?, ?, ?, ?, ?)',
+                rows,
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+    def _search(self, query: str, user_id: str = "u_alex", limit: int = 20) -> Dict[str, Any]:
+        payload = chatindex.ChatSearchRequest(query=query, userId=user_id, limit=limit)
+        return chatindex.search(payload, _search_request())
+
+    def test_message_hits_respect_dm_visibility(self) -> None:
+        self._insert_messages(
+            [
+                ("m_channel", "conv_release", "u_blair", "Release notes are ready for review", "2026-01-04T09:00:00.000Z"),
+                ("m_dm_visible", "conv_dm_alex_blair", "u_blair", "Draft release notes attached", "2026-01-05T09:00:00.000Z"),
+                ("m_dm_hidden", "conv_dm_blair_casey", "u_casey", "Private release notes thread", "2026-01-06T09:00:00.000Z"),
+            ]
+        )
+
+        payload = self._search("release notes")
+        message_ids = {result["messageId"] for result in payload["results"] if result["kind"] == "message"}
+
+        self.assertEqual(message_ids, {"m_channel", "m_dm_visible"})
+        dm_message = next(result for result in payload["results"] if result["id"] == "m_dm_visible")
+        self.assertEqual(dm_message["otherUserId"], "u_blair")
+        self.assertEqual(dm_message["title"], "Blair Chen in DM with Blair Chen")
+        snippets = [result["snippet"] or "" for result in payload["results"] if result["kind"] == "message"]
+        self.assertTrue(all("release notes" in snippet.lower() for snippet in snippets))
+
+    def test_fts_index_tracks_messages_written_after_bootstrap(self) -> None:
+        self._insert_messages(
+            [("m_first", "conv_release", "u_blair", "Kickoff agenda", "2026-01-04T09:00:00.000Z")]
+        )
+        self.assertEqual(self._search("kickoff")["total"], 1)
+        self.assertTrue(chatindex._fts_ready)
+
+        self._insert_messages(
+            [("m_second", "conv_release", "u_alex", "Retro agenda posted", "2026-01-05T09:00:00.000Z")]
+        )
+
+        payload = self._search("retro")
+        self.assertEqual([result["messageId"] for result in payload["results"]], ["m_second"])
+
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            connection.execute('DELETE FROM "Message" WHERE "id" = ?', ("m_second",))
+            connection.commit()
+        finally:
+            connection.close()
+        self.assertEqual(self._search("retro")["total"], 0)
+        self.assertEqual(self._search("agenda")["results"][0]["messageId"], "m_first")
+
+    def test_chat_database_gets_no_fts_objects(self) -> None:
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            connection.executescript(
+                """
+                CREATE VIRTUAL TABLE "Message_fts" USING fts5(body, content='Message', content_rowid='rowid');
+                CREATE TRIGGER "Message_fts_ai" AFTER INSERT ON "Message" BEGIN
+                  INSERT INTO "Message_fts"(rowid, body) VALUES (new.rowid, new.body);
+                END;
+                """
+            )
+        finally:
+            connection.close()
+        self._insert_messages([("m_kickoff", "conv_release", "u_blair", "Kickoff agenda", "2026-01-04T09:00:00.000Z")])
+
+        self.assertEqual(self._search("kickoff")["total"], 1)
+        self.assertTrue(chatindex._fts_ready)
+
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            leftovers = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE '%fts%'"
+            ).fetchall()
+        finally:
+            connection.close()
+        self.assertEqual(leftovers, [])
+
+    def test_long_message_snippet_matches_full_body_snippet(self) -> None:
+        body = ("filler words " * 80) + "deploy checklist signed off " + ("trailing text " * 80)
+        self._insert_messages([("m_long", "conv_release", "u_blair", body, "2026-01-04T09:00:00.000Z")])
+
+        expected = extract_search_snippet(body, "deploy checklist")
+        self.assertEqual(self._search("deploy checklist")["results"][0]["snippet"], expected)
+        chatindex._fts_ready = False
+        self.assertEqual(self._search("deploy checklist")["results"][0]["snippet"], expected)
+
+    def test_channel_and_dm_matches(self) -> None:
+        channel_payload = self._search("release train")
+        channel_results = [result for result in channel_payload["results"] if result["kind"] == "channel"]
+        self.assertEqual([result["channelSlug"] for result in channel_results], ["release-train"])
+
+        dm_payload = self._search("blair")
+        dm_results = [result for result in dm_payload["results"] if result["kind"] == "dm"]
+        self.assertEqual([result["otherUserId"] for result in dm_results], ["u_blair"])
+
+    def test_chat_database_journal_mode_is_left_alone(self) -> None:
+        self.assertEqual(self._search("release")["total"], 1)
+
+        connection = sqlite3.connect(str(self.database_path))
+        try:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        finally:
+            connection.close()
+
+    def test_like_fallback_matches_fts_results(self) -> None:
+        self._insert_messages(
+            [
+                ("m_channel", "conv_release", "u_blair", "Release notes are ready for review", "2026-01-04T09:00:00.000Z"),
+                ("m_dm_visible", "conv_dm_alex_blair", "u_blair", "Draft release notes attached", "2026-01-05T09:00:00.000Z"),
+            ]
+        )
+
+        fts_payload = self._search("release notes")
+        chatindex._fts_ready = False
+        like_payload = self._search("release notes")
+
+        self.assertEqual(
+            sorted(result["id"] for result in like_payload["results"]),
+            sorted(result["id"] for result in fts_payload["results"]),
+        )
+
+    def test_like_fallback_short_needle_matches_word_prefixes(self) -> None:
+        self._insert_messages(
+            [
+                ("m_prefix", "conv_release", "u_blair", "Quick qa pass done", "2026-01-04T09:00:00.000Z"),
+                ("m_inner", "conv_release", "u_blair", "Aqua theme shipped", "2026-01-05T09:00:00.000Z"),
+            ]
+        )
+        chatindex._fts_ready = False
+
+        payload = self._search("qa")
+        self.assertEqual([result["id"] for result in payload["results"]], ["m_prefix"])
+
+    def test_search_reuses_pooled_connection(self) -> None:
+        self._search("release")
+        self.assertEqual(chatindex._connection_pool.qsize(), 1)
+        pooled = chatindex._connection_pool.queue[0]
+
+        self._search("release")
+        self.assertEqual(chatindex._connection_pool.qsize(), 1)
+        self.assertIs(chatindex._connection_pool.queue[0], pooled)
+
+    def test_unknown_user_is_rejected(self) -> None:
+        with self.assertRaises(HTTPException) as context:
+            self._search("release", user_id="u_missing")
+        self.assertEqual(context.exception.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import gzip
+import json
 import os
 import shutil
 import tempfile
+import threading
+import time
 import unittest
 import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import List
 from xml.sax.saxutils import escape
 
 from agent_runtime.search_adapters import officeindex_api as officeindex
@@ -18,18 +24,77 @@ ENV_KEYS = [
     "OFFICEINDEX_OPENSEARCH_URL",
     "OFFICEINDEX_OPENSEARCH_USERNAME",
     "OFFICEINDEX_OPENSEARCH_PASSWORD",
+    "OFFICEINDEX_EXTRACT_WORKERS",
+    "OFFICEINDEX_CACHE_PATH",
 ]
 
 
 def _reset_officeindex_state() -> None:
+    pending_refresh = officeindex._search_refresh_future
+    if pending_refresh is not None:
+        pending_refresh.result()
+
     with officeindex._index_lock:
-        officeindex._index_by_path.clear()
+        officeindex._index_by_path = {}
+        officeindex._token_index = officeindex.EMPTY_TOKEN_INDEX
+        officeindex._index_cache_loaded_root = None
         officeindex._last_indexed_at = 0.0
         officeindex._last_refresh_mode = "none"
         officeindex._last_refresh_summary = {}
         officeindex._last_refresh_error = None
+        officeindex._last_refresh_monotonic = 0.0
+        officeindex._failed_files = {}
 
     officeindex._background_stop.set()
+    officeindex._shutdown_extract_process_pool()
+    officeindex._close_opensearch_pool()
+
+
+class _FakeOpenSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports: List[int] = []
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.client_ports.append(self.client_address[1])
+        body = json.dumps({"docs": [{"doc": {"_source": {"attachment": {"content": "opensearch extracted text"}}}}]})
+        encoded = body.encode("utf-8")
+        gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if gzipped:
+            encoded = gzip.compress(encoded)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+class _StallingOpenSearchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    post_count = 0
+    stall_seconds = 0.0
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        type(self).post_count += 1
+        time.sleep(self.stall_seconds)
+        encoded = b"{}"
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+        except OSError:
+            return
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
 
 
 def _write_ooxml(rel_path: Path, member_path: str, text: str) -> None:
@@ -46,6 +111,7 @@ class OfficeIndexAdapterTests(unittest.TestCase):
         os.environ["WORKSPACE_FILES_ROOT"] = str(self.temp_dir)
         os.environ["OFFICEINDEX_REFRESH_INTERVAL_SECONDS"] = "0"
         os.environ["OFFICEINDEX_BACKGROUND_SYNC_SECONDS"] = "0"
+        os.environ["OFFICEINDEX_CACHE_PATH"] = str(self.temp_dir / ".cache" / "officeindex.sqlite3")
         os.environ.pop("OFFICEINDEX_OPENSEARCH_URL", None)
         os.environ.pop("OFFICEINDEX_OPENSEARCH_USERNAME", None)
         os.environ.pop("OFFICEINDEX_OPENSEARCH_PASSWORD", None)
@@ -144,6 +210,185 @@ class OfficeIndexAdapterTests(unittest.TestCase):
         self.assertEqual(results_by_path[content_exact]["sourceMeta"]["matchKind"], "content-exact-phrase")
         self.assertEqual(results_by_path[content_partial]["sourceMeta"]["matchKind"], "content-partial")
 
+    def test_content_matches_span_partial_tokens(self) -> None:
+        self._create_docx("docs/kickoff.docx", "alpha planning checklist")
+        self._create_docx("docs/other.docx", "beta launch review")
+
+        officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+
+        for query in ["lpha plann", "planning check", "annin"]:
+            payload = officeindex.search(officeindex.OfficeSearchRequest(query=query, limit=5))
+            self.assertEqual([result["filePath"] for result in payload["results"]], ["docs/kickoff.docx"], query)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="alpha launch", limit=5))
+        self.assertEqual(payload["results"], [])
+
+    def test_infix_match_falls_back_to_document_scan_for_large_vocabulary(self) -> None:
+        self._create_docx("docs/kickoff.docx", "alpha planning checklist")
+        self._create_docx("docs/other.docx", "beta launch review")
+        officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+
+        previous_cap = officeindex.MAX_INFIX_SCAN_TOKENS
+        officeindex.MAX_INFIX_SCAN_TOKENS = 1
+        self.addCleanup(setattr, officeindex, "MAX_INFIX_SCAN_TOKENS", previous_cap)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="annin", limit=5))
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["docs/kickoff.docx"])
+
+    def test_incremental_reindex_reuses_unchanged_files(self) -> None:
+        os.environ["OFFICEINDEX_EXTRACT_WORKERS"] = "2"
+        for index in range(6):
+            self._create_docx(f"notes/note-{index}.docx", f"quarterly note number {index}")
+
+        first = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(first["updatedFiles"], 6)
+
+        self._create_docx("notes/note-0.docx", "rewritten kickoff memo")
+        second = officeindex.reindex(officeindex.OfficeReindexRequest(mode="incremental"))
+        self.assertEqual(second["indexedFiles"], 6)
+        self.assertEqual(second["reusedFiles"] + second["updatedFiles"], 6)
+        self.assertGreaterEqual(second["updatedFiles"], 1)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="rewritten kickoff memo", limit=5))
+        self.assertEqual(payload["results"][0]["filePath"], "notes/note-0.docx")
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "requires POSIX FIFOs")
+    def test_scan_skips_dangling_symlinks_and_fifos(self) -> None:
+        self._create_docx("docs/plan.docx", "orbit planning memo")
+        os.symlink(self.temp_dir / "docs" / "missing.docx", self.temp_dir / "docs" / "dangling.docx")
+        os.mkfifo(self.temp_dir / "docs" / "pipe.docx")
+
+        summary = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(summary["indexedFiles"], 1)
+        self.assertEqual(summary["failedFiles"], 0)
+        self.assertEqual(summary["diagnostics"], [])
+
+    def test_directory_cap_keeps_shallow_sibling_folders(self) -> None:
+        depth = officeindex.MAX_SCAN_DIRECTORIES // 4
+        for index in range(10):
+            self._create_docx(f"team-{index}/summary-{index}.docx", f"sibling summary {index}")
+            (self.temp_dir / f"team-{index}").joinpath(*(["nested"] * depth)).mkdir(parents=True)
+
+        summary = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(summary["indexedFiles"], 10)
+
+    def test_degraded_flag_drops_failures_resolved_since_refresh(self) -> None:
+        os.environ["OFFICEINDEX_REFRESH_INTERVAL_SECONDS"] = "3600"
+        self._create_docx("docs/broken.docx", "orbit broken memo")
+        self._create_docx("docs/stale.docx", "orbit stale memo")
+        officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+
+        broken = self.temp_dir / "docs" / "broken.docx"
+        stats = broken.stat()
+        with officeindex._index_lock:
+            officeindex._failed_files = {
+                "docs/broken.docx": (str(broken), (stats.st_mtime_ns, stats.st_size)),
+                "docs/stale.docx": (str(self.temp_dir / "docs" / "stale.docx"), (1, 1)),
+            }
+            officeindex._last_refresh_summary = {
+                "failedFiles": 2,
+                "diagnostics": ["file-extract-failed:docs/broken.docx", "file-hash-failed:docs/stale.docx"],
+            }
+
+        officeindex._prune_resolved_failures()
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="orbit", limit=5))
+        self.assertTrue(payload["degraded"])
+        self.assertEqual(payload["diagnostics"], ["file-extract-failed:docs/broken.docx"])
+
+        broken.unlink()
+        officeindex._prune_resolved_failures()
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="orbit", limit=5))
+        self.assertNotIn("degraded", payload)
+
+    def test_large_local_batch_extracts_on_process_pool(self) -> None:
+        os.environ["OFFICEINDEX_EXTRACT_WORKERS"] = "2"
+        file_count = officeindex.PROCESS_POOL_MIN_FILES + 2
+        for index in range(file_count):
+            self._create_pptx(f"decks/deck-{index}.pptx", f"storyline deck marker {index}")
+
+        summary = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(summary["updatedFiles"], file_count)
+        self.assertEqual(summary["failedFiles"], 0)
+        process_pool = officeindex._extract_process_pool
+        self.assertIsNotNone(process_pool)
+
+        officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        for index in range(file_count):
+            os.utime(self.temp_dir / "decks" / f"deck-{index}.pptx", ns=(1, 1))
+        touched = officeindex.reindex(officeindex.OfficeReindexRequest(mode="incremental"))
+        self.assertEqual(touched["reusedFiles"], file_count)
+        self.assertIs(officeindex._extract_process_pool, process_pool)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="storyline deck marker 3", limit=5))
+        self.assertEqual(payload["results"][0]["filePath"], "decks/deck-3.pptx")
+
+    def test_persisted_index_survives_restart(self) -> None:
+        self._create_docx("docs/roadmap.docx", "nebula docx launch marker")
+        self._create_docx("docs/retired.docx", "legacy memo")
+
+        first = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(first["updatedFiles"], 2)
+
+        (self.temp_dir / "docs" / "retired.docx").unlink()
+        _reset_officeindex_state()
+
+        second = officeindex.reindex(officeindex.OfficeReindexRequest(mode="incremental"))
+        self.assertEqual(second["reusedFiles"], 1)
+        self.assertEqual(second["updatedFiles"], 0)
+        self.assertEqual(second["removedFiles"], 1)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="nebula docx launch", limit=5))
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["docs/roadmap.docx"])
+
+        _reset_officeindex_state()
+        third = officeindex.reindex(officeindex.OfficeReindexRequest(mode="incremental"))
+        self.assertEqual(third["indexedFiles"], 1)
+        self.assertEqual(third["removedFiles"], 0)
+
+    def test_opensearch_extraction_reuses_keep_alive_connection(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenSearchHandler)
+        _FakeOpenSearchHandler.client_ports = []
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        os.environ["OFFICEINDEX_OPENSEARCH_URL"] = f"http://127.0.0.1:{server.server_port}"
+        os.environ["OFFICEINDEX_EXTRACT_WORKERS"] = "1"
+        for index in range(3):
+            self._create_docx(f"remote/doc-{index}.docx", f"local text {index}")
+
+        summary = officeindex.reindex(officeindex.OfficeReindexRequest(mode="full"))
+        self.assertEqual(summary["updatedFiles"], 3)
+        self.assertEqual(len(_FakeOpenSearchHandler.client_ports), 3)
+        self.assertEqual(len(set(_FakeOpenSearchHandler.client_ports)), 1)
+
+        payload = officeindex.search(officeindex.OfficeSearchRequest(query="opensearch extracted", limit=5))
+        self.assertEqual(payload["total"], 3)
+        self.assertEqual(payload["results"][0]["sourceMeta"]["extractor"], "opensearch")
+
+
+    def test_opensearch_timeout_is_not_retried(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StallingOpenSearchHandler)
+        server.daemon_threads = True
+        _StallingOpenSearchHandler.post_count = 0
+        _StallingOpenSearchHandler.stall_seconds = 0.0
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        endpoint = f"http://127.0.0.1:{server.server_port}/_ingest/pipeline/attachment/_simulate"
+        headers = {"Content-Type": "application/json"}
+
+        status, _ = officeindex._post_to_opensearch(endpoint, b"{}", headers, timeout=1)
+        self.assertEqual(status, 200)
+        self.assertEqual(officeindex._opensearch_pool.qsize(), 1)
+
+        _StallingOpenSearchHandler.stall_seconds = 2.0
+        with self.assertRaises(TimeoutError):
+            officeindex._post_to_opensearch(endpoint, b"{}", headers, timeout=1)
+        self.assertEqual(_StallingOpenSearchHandler.post_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from agent_runtime.search_adapters import pageindex_api as pageindex
+
+
+ENV_KEYS = ["WORKSPACE_FILES_ROOT", "PAGEINDEX_REFRESH_INTERVAL_SECONDS"]
+
+
+def _reset_pageindex_state() -> None:
+    pageindex._page_index = None
+    pageindex._verified_workspace_root = None
+
+
+class PageIndexAdapterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="openwork-pageindex-tests-"))
+        self.previous_env = {key: os.environ.get(key) for key in ENV_KEYS}
+
+        os.environ["WORKSPACE_FILES_ROOT"] = str(self.temp_dir)
+        os.environ["PAGEINDEX_REFRESH_INTERVAL_SECONDS"] = "0"
+
+        _reset_pageindex_state()
+
+    def tearDown(self) -> None:
+        _reset_pageindex_state()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+        for key, value in self.previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def _write(self, relative_path: str, text: str) -> None:
+        target = self.temp_dir / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+
+    def _search(self, query: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        return pageindex.search(pageindex.PageSearchRequest(query=query, limit=limit))
+
+    def test_path_hits_outrank_content_hits(self) -> None:
+        self._write("notes/roadmap.md", "Quarterly planning overview")
+        self._write("notes/summary.txt", "The roadmap review happens on Friday")
+
+        payload = self._search("roadmap")
+
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["notes/roadmap.md", "notes/summary.txt"])
+        self.assertIsNone(payload["results"][0]["snippet"])
+        self.assertIn("roadmap review", payload["results"][1]["snippet"])
+        self.assertEqual(payload["results"][0]["title"], "roadmap.md")
+
+    def test_excluded_and_hidden_entries_are_skipped(self) -> None:
+        self._write("node_modules/pkg/marker.md", "marker")
+        self._write(".git/marker.md", "marker")
+        self._write("docs/.marker.md", "marker")
+        self._write("docs/~$marker.md", "marker")
+        self._write("docs/visible-marker.md", "marker")
+
+        payload = self._search("marker")
+
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["docs/visible-marker.md"])
+
+    def test_content_search_only_reads_editable_text(self) -> None:
+        self._write("data/report.md", "Budget forecast for launch")
+        self._write("data/report.bin", "Budget forecast for launch")
+        self._write("data/broken.txt", "")
+        (self.temp_dir / "data" / "broken.txt").write_bytes(b"\xff\xfe forecast")
+
+        payload = self._search("forecast")
+
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["data/report.md"])
+
+    def test_limit_truncates_sorted_results(self) -> None:
+        for index in range(5):
+            self._write(f"pages/topic-{index}.md", "body")
+
+        payload = self._search("topic", limit=2)
+
+        self.assertEqual(payload["total"], 2)
+        self.assertEqual([result["filePath"] for result in payload["results"]], ["pages/topic-4.md", "pages/topic-3.md"])
+
+    def test_listing_is_reused_within_refresh_interval(self) -> None:
+        os.environ["PAGEINDEX_REFRESH_INTERVAL_SECONDS"] = "60"
+        self._write("plans/alpha-plan.md", "first draft")
+        self.assertEqual(self._search("plan")["total"], 1)
+        indexed = pageindex._page_index
+
+        self._write("plans/beta-plan.md", "second draft")
+        (self.temp_dir / "plans" / "alpha-plan.md").write_text("first draft, revised", encoding="utf-8")
+        self.assertEqual(self._search("plan")["total"], 1)
+        self.assertIs(pageindex._page_index, indexed)
+        self.assertIn("revised", self._search("revised")["results"][0]["snippet"])
+
+        os.environ["PAGEINDEX_REFRESH_INTERVAL_SECONDS"] = "0"
+        self.assertEqual(self._search("plan")["total"], 2)
+
+    def test_missing_workspace_root_is_reported(self) -> None:
+        os.environ["WORKSPACE_FILES_ROOT"] = str(self.temp_dir / "missing")
+
+        with self.assertRaises(HTTPException) as context:
+            self._search("anything")
+        self.assertEqual(context.exception.status_code, 503)
+
+
+if __name__ == "__main__":
+    unittest.main()